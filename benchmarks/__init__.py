@@ -0,0 +1 @@
+"""Performance benchmarks for TextMap. Run the suite with `python -m benchmarks`, or a focused module with `python -m benchmarks.<name>`."""
@@ -0,0 +1,49 @@
+"""Run the benchmark suite, or compare two saved runs: `python -m benchmarks [run|compare] ...`."""
+import argparse
+import sys
+
+from .suite import (DEFAULT_DENSITIES, DEFAULT_SIZES, DEFAULT_THRESHOLD, compare, load_results,
+                    run_suite, save_results)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__)
+    subparsers = parser.add_subparsers(dest='command')
+
+    run_parser = subparsers.add_parser('run', help='Run the suite (the default)')
+    run_parser.add_argument('--output', '-o', help='Save results as JSON')
+    run_parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                            help='Carrier sizes in characters')
+    run_parser.add_argument('--densities', type=float, nargs='+', default=DEFAULT_DENSITIES,
+                            help='Secret lengths as fractions of the carrier content')
+    run_parser.add_argument('--repeat', type=int, default=3)
+    run_parser.add_argument('--no-memory', action='store_true', help='Skip peak memory measurement')
+    run_parser.add_argument('--no-cli', action='store_true', help='Skip the CLI wall time runs')
+
+    compare_parser = subparsers.add_parser('compare', help='Compare two saved runs')
+    compare_parser.add_argument('baseline', help='Results JSON of the reference run')
+    compare_parser.add_argument('current', help='Results JSON of the run to check')
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                                help='Allowed slowdown as a fraction (default: 0.10)')
+
+    args = parser.parse_args(sys.argv[1:] or ['run'])
+
+    if args.command == 'compare':
+        regressions = compare(load_results(args.baseline), load_results(args.current), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regressions over {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("\nNo regressions")
+        return
+
+    document = run_suite(args.sizes, args.densities, args.repeat,
+                         measure_memory=not args.no_memory, cli=not args.no_cli)
+    if args.output:
+        save_results(document, args.output)
+        print(f"\nResults saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Event-loop latency while an async service handles concurrent decode requests:
+calling MnemonicEncoder directly in the loop versus AsyncMnemonicEncoder on
+threads and on worker processes. A ticker coroutine asks to wake every
+millisecond; its lateness is the delay every other request would see.
+"""
+import argparse
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Awaitable, Callable, List
+
+from textmap import AsyncMnemonicEncoder, MnemonicEncoder
+from .common import make_carrier, make_secret, quiet_logging
+
+TICK = 0.001
+
+
+async def ticker(lags: List[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - start - TICK)
+
+
+async def load(call: Callable[[], Awaitable[object]], clients: int, requests: int) -> float:
+    """Run `requests` calls from each of `clients` concurrent clients; returns requests per second."""
+    async def client() -> None:
+        for _ in range(requests):
+            await call()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    return clients * requests / (time.perf_counter() - start)
+
+
+async def measure(name: str, call: Callable[[], Awaitable[object]], clients: int, requests: int) -> None:
+    lags: List[float] = []
+    stop = asyncio.Event()
+    tick = asyncio.ensure_future(ticker(lags, stop))
+    await asyncio.sleep(0.05)
+    rate = await load(call, clients, requests)
+    stop.set()
+    await tick
+
+    lags.sort()
+    p50, p99 = (lags[min(len(lags) - 1, int(len(lags) * q))] * 1e3 for q in (0.5, 0.99))
+    print(f"{name:>10} {clients:>8} {rate:>10.1f} {p50:>8.2f} {p99:>8.2f} {lags[-1] * 1e3:>8.2f}")
+
+
+async def run(carrier_size: int, clients: List[int], requests: int, workers: int) -> None:
+    text = make_carrier(carrier_size)
+    secret = make_secret(100)
+    encoder = MnemonicEncoder()
+    key = encoder.encode_key(secret, text)
+
+    async def blocking() -> str:
+        return encoder.decode(text, key)
+
+    print(f"{carrier_size} char carrier, {requests} requests per client; loop lag in ms")
+    print(f"{'executor':>10} {'clients':>8} {'req/s':>10} {'p50 lag':>8} {'p99 lag':>8} {'max lag':>8}")
+    threads = AsyncMnemonicEncoder(max_concurrency=workers)
+    with ProcessPoolExecutor(workers) as pool:
+        processes = AsyncMnemonicEncoder(executor=pool, max_concurrency=workers)
+        for count in clients:
+            await measure('in loop', blocking, count, requests)
+            await measure('threads', lambda: threads.decode(text, key), count, requests)
+            await measure('processes', lambda: processes.decode(text, key), count, requests)
+    threads.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--carrier-size', type=int, default=2_000_000)
+    parser.add_argument('--clients', type=int, nargs='+', default=[1, 8, 32])
+    parser.add_argument('--requests', type=int, default=4)
+    parser.add_argument('--workers', type=int, default=4, help='max_concurrency and pool size')
+    args = parser.parse_args()
+
+    quiet_logging()
+    asyncio.run(run(args.carrier_size, args.clients, args.requests, args.workers))
+
+
+if __name__ == '__main__':
+    main()
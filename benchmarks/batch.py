@@ -0,0 +1,45 @@
+"""Compare encode/decode called per job against encode_many/decode_many."""
+import argparse
+
+from textmap import MnemonicEncoder
+from .common import best_of, make_carrier, make_secret, quiet_logging
+
+
+def run(carrier_size: int, carriers: int, batch_sizes) -> None:
+    encoder = MnemonicEncoder()
+    texts = [make_carrier(carrier_size, seed) for seed in range(carriers)]
+
+    print(f"carrier size {carrier_size} chars, {carriers} distinct carriers")
+    print(f"{'batch':>8} {'single jobs/s':>14} {'batch jobs/s':>14} {'speedup':>8}")
+    for batch_size in batch_sizes:
+        secrets = [make_secret(40, i) for i in range(batch_size)]
+        jobs = [(secret, texts[i % carriers]) for i, secret in enumerate(secrets)]
+
+        single, _ = best_of(lambda: [encoder.encode(m, t) for m, t in jobs])
+        batched, encoded = best_of(lambda: encoder.encode_many(jobs))
+
+        decode_jobs = [(text, key) for text, key in encoded]
+        single += best_of(lambda: [encoder.decode(t, k) for t, k in decode_jobs])[0]
+        batched_decode, decoded = best_of(lambda: encoder.decode_many(decode_jobs))
+        batched += batched_decode
+
+        if decoded != [encoder.decode(t, k) for t, k in decode_jobs] or decoded != secrets:
+            raise SystemExit("batch results differ from the single-call path")
+
+        print(f"{batch_size:>8} {2 * batch_size / single:>14.1f} "
+              f"{2 * batch_size / batched:>14.1f} {single / batched:>7.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--carrier-size', type=int, default=200_000)
+    parser.add_argument('--carriers', type=int, default=4)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 10, 100, 1000])
+    args = parser.parse_args()
+
+    quiet_logging()
+    run(args.carrier_size, args.carriers, args.batch_sizes)
+
+
+if __name__ == '__main__':
+    main()
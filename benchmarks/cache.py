@@ -0,0 +1,48 @@
+"""Repeated encodes and decodes over a small carrier set with and without a CarrierCache."""
+import argparse
+
+from textmap import CarrierCache, MnemonicEncoder
+from .common import best_of, make_carrier, quiet_logging
+
+
+def run(carrier_size: int, carriers: int, operations: int, repeat: int) -> None:
+    texts = [make_carrier(carrier_size, seed) for seed in range(carriers)]
+    keys = [MnemonicEncoder().encode('correct horse battery staple', text)[1] for text in texts]
+    jobs = [(texts[i % carriers], keys[i % carriers]) for i in range(operations)]
+
+    print(f"{operations} operations over {carriers} carriers of {carrier_size} chars")
+    for operation in ('decode', 'encode'):
+        plain = MnemonicEncoder()
+        cache = CarrierCache()
+        cached_encoder = MnemonicEncoder(cache=cache)
+
+        if operation == 'decode':
+            def batch(encoder):
+                return [encoder.decode(text, key) for text, key in jobs]
+        else:
+            def batch(encoder):
+                return [len(encoder.encode_key('correct horse battery staple', text)) for text, _ in jobs]
+
+        uncached, expected = best_of(lambda: batch(plain), repeat)
+        cached, results = best_of(lambda: batch(cached_encoder), repeat)
+        if results != expected:
+            raise SystemExit(f"cached {operation} results differ from uncached ones")
+
+        print(f"{operation}: uncached {operations / uncached:>9.1f} ops/s, "
+              f"cached {operations / cached:>9.1f} ops/s ({uncached / cached:.1f}x), {cache.info()}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--carrier-size', type=int, default=1_000_000)
+    parser.add_argument('--carriers', type=int, default=8)
+    parser.add_argument('--operations', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    quiet_logging()
+    run(args.carrier_size, args.carriers, args.operations, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
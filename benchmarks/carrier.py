@@ -0,0 +1,77 @@
+"""Compare the fused carrier analysis against the original normalize/strip/validate passes."""
+import argparse
+import tracemalloc
+
+from textmap.text_processor import TextProcessor
+from .common import best_of, make_carrier
+from .normalize import legacy_normalize_text
+
+
+def legacy_validate_text_source(text: str) -> bool:
+    """The multi-pass validate_text_source used before carrier analysis was fused."""
+    if not text:
+        return False
+    non_whitespace = ''.join(char for char in text if not char.isspace())
+    if len(non_whitespace) < 100:
+        return False
+    unique_chars = set(char for char in text if not char.isspace())
+    if len(unique_chars) < 20:
+        return False
+    char_counts = {}
+    total_chars = 0
+    for char in non_whitespace:
+        char_counts[char] = char_counts.get(char, 0) + 1
+        total_chars += 1
+    if total_chars > 0:
+        max_freq = max(char_counts.values()) / total_chars
+        if max_freq > 0.3:
+            return False
+    has_upper = any(c.isupper() for c in text)
+    has_lower = any(c.islower() for c in text)
+    return has_upper and has_lower
+
+
+def legacy_pipeline(text: str):
+    stripped = ''.join(c for c in legacy_normalize_text(text) if not c.isspace())
+    return stripped, legacy_validate_text_source(stripped)
+
+
+def fused_pipeline(text: str):
+    content = TextProcessor.extract_content(text)
+    return content, TextProcessor.validate_stats(TextProcessor.text_stats(content))
+
+
+def peak_memory(func, text: str) -> int:
+    """Peak bytes allocated by func(text), excluding the input itself."""
+    tracemalloc.start()
+    try:
+        func(text)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(sizes, repeat: int) -> None:
+    print(f"{'chars':>11} {'legacy s':>9} {'fused s':>9} {'speedup':>8} {'legacy MB':>10} {'fused MB':>9}")
+    for size in sizes:
+        text = make_carrier(size)
+        legacy_time, expected = best_of(lambda: legacy_pipeline(text), repeat)
+        fused_time, result = best_of(lambda: fused_pipeline(text), repeat)
+        if result != expected:
+            raise SystemExit(f"fused analysis differs from the legacy pipeline for {size} chars")
+        legacy_peak = peak_memory(legacy_pipeline, text) / 1e6
+        fused_peak = peak_memory(fused_pipeline, text) / 1e6
+        print(f"{size:>11} {legacy_time:>9.3f} {fused_time:>9.3f} {legacy_time / fused_time:>7.1f}x "
+              f"{legacy_peak:>10.1f} {fused_peak:>9.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000, 10_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
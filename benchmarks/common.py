@@ -0,0 +1,63 @@
+import logging
+import random
+import time
+from typing import Callable, Tuple
+
+# Sample vocabulary used to build natural-looking carrier texts
+WORDS = (
+    "The quick brown fox jumps over the lazy dog. Pack my box with five dozen "
+    "liquor jugs! How vexingly quick daft zebras jump? Sphinx of black quartz, "
+    "judge my vow. In 1984 the Committee met 27 times, and 3 of those meetings "
+    "ran late."
+).split()
+
+
+def quiet_logging() -> None:
+    """Silence library logging so it does not dominate the timings."""
+    logging.disable(logging.CRITICAL)
+
+
+def make_carrier(size: int, seed: int = 0) -> str:
+    """Build a deterministic carrier text of roughly `size` characters."""
+    rng = random.Random(seed)
+    words = []
+    length = 0
+    while length < size:
+        word = rng.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+        if rng.random() < 0.05:
+            words.append("\n")
+    return ' '.join(words)[:size]
+
+
+def make_secret(length: int, seed: int = 0) -> str:
+    """Build a deterministic secret made of words separated by spaces."""
+    rng = random.Random(seed)
+    alphabet = "abcdefghijklmnopqrstuvwxyz"
+    chars = []
+    while len(chars) < length:
+        chars.extend(rng.choice(alphabet) for _ in range(rng.randint(3, 8)))
+        chars.append(' ')
+    return ''.join(chars[:length]).strip() or "secret"
+
+
+def best_of(func: Callable[[], object], repeat: int = 3) -> Tuple[float, object]:
+    """Run func `repeat` times and return the best wall time with the last result."""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def write_carrier_file(path, size: int, seed: int = 0) -> None:
+    """Write a carrier file of `size` bytes by repeating a 1 MB generated block."""
+    block = make_carrier(min(size, 1_000_000), seed).encode('ascii')
+    with open(path, 'wb') as f:
+        remaining = size
+        while remaining > 0:
+            f.write(block[:remaining])
+            remaining -= len(block)
@@ -0,0 +1,55 @@
+"""Throughput of decode_batch for increasing worker counts."""
+import argparse
+import os
+import tempfile
+import time
+
+from textmap import MnemonicEncoder
+from textmap.batch import decode_batch
+from textmap.carrier import MappedCarrier
+from .common import make_secret, quiet_logging, write_carrier_file
+
+
+def build_jobs(directory: str, files: int, keys_per_file: int, size: int):
+    """Write carrier files and encode secrets into them, returning (jobs, expected)."""
+    encoder = MnemonicEncoder(key_version='v3')
+    jobs = []
+    expected = []
+    for number in range(files):
+        path = os.path.join(directory, f'carrier-{number}.txt')
+        write_carrier_file(path, size, seed=number)
+        with MappedCarrier(path) as carrier:
+            for index in range(keys_per_file):
+                secret = make_secret(40, number * keys_per_file + index)
+                jobs.append((path, encoder.encode_key(secret, carrier)))
+                expected.append(secret)
+    return jobs, expected
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--files', type=int, default=16)
+    parser.add_argument('--keys-per-file', type=int, default=50)
+    parser.add_argument('--size', type=int, default=2_000_000, help='Carrier file size in bytes')
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    args = parser.parse_args()
+
+    quiet_logging()
+    with tempfile.TemporaryDirectory() as tmp:
+        jobs, expected = build_jobs(tmp, args.files, args.keys_per_file, args.size)
+        print(f"{len(jobs)} jobs over {args.files} files of {args.size} bytes, {os.cpu_count()} CPUs")
+        print(f"{'workers':>8} {'seconds':>8} {'jobs/s':>9} {'speedup':>8}")
+        baseline = None
+        for workers in args.workers:
+            start = time.perf_counter()
+            results = decode_batch(jobs, workers=workers)
+            elapsed = time.perf_counter() - start
+            if [result.get('decoded') for result in results] != expected:
+                raise SystemExit("decode_batch returned unexpected results")
+            baseline = baseline or elapsed
+            print(f"{workers:>8} {elapsed:>8.2f} {len(jobs) / elapsed:>9.1f} {baseline / elapsed:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
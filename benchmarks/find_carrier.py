@@ -0,0 +1,64 @@
+"""
+`find-carrier` throughput: files checked per second against a v4 key's carrier
+tag when the matching file is last in a directory, for each worker count, and
+the cost of rejecting a wrong carrier in decode.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from textmap import MnemonicEncoder, TextCarrier
+from textmap.batch import find_carrier
+from .common import best_of, make_carrier, make_secret, quiet_logging, write_carrier_file
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--files', type=int, default=2000)
+    parser.add_argument('--size', type=int, default=20_000, help='Bytes per carrier file')
+    parser.add_argument('--secret-length', type=int, default=100)
+    parser.add_argument('--workers', type=int, nargs='+', default=sorted({1, os.cpu_count() or 1}))
+    args = parser.parse_args()
+
+    quiet_logging()
+    secret = make_secret(args.secret_length)
+    encoder = MnemonicEncoder(key_version='v4')
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for number in range(args.files):
+            path = os.path.join(directory, f'carrier{number:05}.txt')
+            write_carrier_file(path, args.size, seed=number)
+            paths.append(path)
+        with open(paths[-1], encoding='ascii') as f:
+            target = f.read()
+        key = encoder.encode_key(secret, target)
+
+        print(f"{args.files} files of {args.size} bytes, {args.secret_length} char secret")
+        for workers in args.workers:
+            start = time.perf_counter()
+            found = find_carrier(key, paths, workers=workers)
+            elapsed = time.perf_counter() - start
+            if found != paths[-1]:
+                raise SystemExit("find_carrier missed the matching file")
+            print(f"find-carrier, {workers} workers: {elapsed:.2f} s ({args.files / elapsed:.0f} files/s)")
+
+    # A wrong carrier: v3 decodes garbage, v4 stops at the tag check
+    wrong = TextCarrier(make_carrier(args.size, seed=1))
+    right = TextCarrier(target)
+    for version in ('v3', 'v4'):
+        versioned = MnemonicEncoder(key_version=version)
+        versioned_key = versioned.encode_key(secret, right)
+
+        def decode_wrong() -> None:
+            try:
+                versioned.decode(wrong, versioned_key)
+            except ValueError:
+                pass
+
+        elapsed, _ = best_of(lambda: [decode_wrong() for _ in range(1000)])
+        print(f"decode with the wrong carrier, {version}: {elapsed / 1000 * 1e6:.1f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""Count hash calls, peak memory and time per generated position for each key version."""
+import argparse
+import hashlib
+import secrets
+import tracemalloc
+
+from textmap import MnemonicEncoder
+from .common import best_of, quiet_logging
+
+HASHES = ('sha256', 'sha512', 'shake_256')
+
+
+class HashCounter:
+    """Wrap hashlib constructors to count how often they are called."""
+
+    def __init__(self):
+        self.calls = 0
+        self._originals = {}
+
+    def __enter__(self):
+        for name in HASHES:
+            original = getattr(hashlib, name)
+            self._originals[name] = original
+
+            def counted(*args, _original=original, **kwargs):
+                self.calls += 1
+                return _original(*args, **kwargs)
+
+            setattr(hashlib, name, counted)
+        return self
+
+    def __exit__(self, *exc_info):
+        for name, original in self._originals.items():
+            setattr(hashlib, name, original)
+
+
+def peak_bytes(func) -> int:
+    """Peak bytes allocated while func runs."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(secret_lengths, versions, repeat: int) -> None:
+    encoder = MnemonicEncoder()
+    main_key = secrets.token_hex(32)
+
+    print(f"{'positions':>10} {'version':>8} {'us/pos':>8} {'hashes/pos':>11} {'peak B/pos':>11}")
+    for count in secret_lengths:
+        text_length = count * 4
+        for version in versions:
+            generate = lambda: encoder._positions_for(version, text_length, count, main_key)
+            elapsed, _ = best_of(generate, repeat)
+            with HashCounter() as counter:
+                generate()
+            peak = peak_bytes(generate)
+            print(f"{count:>10} {version:>8} {elapsed / count * 1e6:>8.2f} "
+                  f"{counter.calls / count:>11.4f} {peak / count:>11.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--secret-lengths', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    parser.add_argument('--versions', nargs='+', default=sorted(MnemonicEncoder.KEY_VERSIONS))
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    quiet_logging()
+    run(args.secret_lengths, args.versions, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
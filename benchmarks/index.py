@@ -0,0 +1,49 @@
+"""Cold (no sidecar index) versus warm (indexed) `textmap decode` wall time."""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+from textmap import MnemonicEncoder
+from textmap.carrier import MappedCarrier, index_path
+from .common import best_of, quiet_logging, write_carrier_file
+
+SECRET = 'correct horse battery staple'
+
+
+def cli_decode(path: str, key: str) -> str:
+    env = dict(os.environ, PYTHONPATH=os.getcwd())
+    result = subprocess.run([sys.executable, '-m', 'textmap.cli', 'decode', '-t', path, '-k', key],
+                            check=True, env=env, capture_output=True, text=True)
+    return result.stdout.strip()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes-mb', type=int, nargs='+', default=[10, 100, 500])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    quiet_logging()
+    print(f"{'file MB':>8} {'cold s':>8} {'warm s':>8} {'speedup':>8} {'index KB':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size_mb in args.sizes_mb:
+            path = os.path.join(tmp, f'carrier-{size_mb}.txt')
+            write_carrier_file(path, size_mb * 1_000_000)
+            with MappedCarrier(path, use_index=False) as carrier:
+                key = MnemonicEncoder(key_version='v3').encode_key(SECRET, carrier)
+
+            cold, cold_result = best_of(lambda: cli_decode(path, key), args.repeat)
+            with MappedCarrier(path, use_index=False) as carrier:
+                carrier.write_index()
+            warm, warm_result = best_of(lambda: cli_decode(path, key), args.repeat)
+            if not cold_result == warm_result == SECRET:
+                raise SystemExit("decode results differ between cold and warm runs")
+
+            index_kb = os.path.getsize(index_path(path)) / 1024
+            print(f"{size_mb:>8} {cold:>8.3f} {warm:>8.3f} {cold / warm:>7.1f}x {index_kb:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
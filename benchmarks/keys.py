@@ -0,0 +1,51 @@
+"""Key size and parse time of text and binary keys across secret lengths."""
+import argparse
+
+from textmap import MnemonicEncoder
+from .common import best_of, make_carrier, make_secret, quiet_logging
+
+
+def legacy_parse_offsets(key: str) -> list:
+    """Offset parsing as done before keys were parsed with bytes.fromhex."""
+    offsets_hex = key.split('-')[3]
+    return [int(offsets_hex[i:i+2], 16) for i in range(0, len(offsets_hex), 2)]
+
+
+def run(secret_lengths, carrier_size: int, parses: int, repeat: int) -> None:
+    text = make_carrier(carrier_size)
+    text_encoder = MnemonicEncoder()
+    binary_encoder = MnemonicEncoder(key_format="binary")
+
+    print(f"{'secret':>8} {'text B':>8} {'binary B':>9} {'legacy us':>10} {'text us':>8} {'binary us':>10}")
+    for length in secret_lengths:
+        text_key = text_encoder.encode_key(make_secret(length), text)
+        binary_key = text_encoder.convert_key(text_key, "binary")
+        if binary_encoder.convert_key(binary_key, "text") != text_key:
+            raise SystemExit("binary key does not convert back to the text key")
+
+        legacy, expected = best_of(lambda: [legacy_parse_offsets(text_key) for _ in range(parses)], repeat)
+        text_time, text_parts = best_of(
+            lambda: [text_encoder._extract_key_parts(text_key) for _ in range(parses)], repeat)
+        binary_time, binary_parts = best_of(
+            lambda: [text_encoder._extract_key_parts(binary_key) for _ in range(parses)], repeat)
+        if list(text_parts[0][3]) != expected[0] or binary_parts[0] != text_parts[0]:
+            raise SystemExit("key formats parse to different components")
+
+        print(f"{length:>8} {len(text_key):>8} {len(binary_key):>9} {legacy / parses * 1e6:>10.1f} "
+              f"{text_time / parses * 1e6:>8.1f} {binary_time / parses * 1e6:>10.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--secret-lengths', type=int, nargs='+', default=[100, 1_000, 10_000])
+    parser.add_argument('--carrier-size', type=int, default=200_000)
+    parser.add_argument('--parses', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    quiet_logging()
+    run(args.secret_lengths, args.carrier_size, args.parses, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+CarrierLibrary costs on a directory of generated carriers: the initial scan per
+worker count, an incremental refresh with nothing changed, loading the saved
+index, and pick() latency.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from textmap.library import CarrierLibrary
+from .common import best_of, make_carrier
+
+
+def write_library(directory: str, files: int, max_size: int) -> None:
+    rng = random.Random(0)
+    for number in range(files):
+        with open(os.path.join(directory, f'carrier{number:05}.txt'), 'w', encoding='ascii') as f:
+            f.write(make_carrier(rng.randint(100, max_size), seed=number))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--files', type=int, default=5000)
+    parser.add_argument('--max-size', type=int, default=50_000, help='Largest carrier in characters')
+    parser.add_argument('--workers', type=int, nargs='+', default=sorted({1, os.cpu_count() or 1}))
+    parser.add_argument('--picks', type=int, default=10_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        write_library(directory, args.files, args.max_size)
+        print(f"{args.files} files of up to {args.max_size} characters")
+
+        library = CarrierLibrary(directory)
+        for workers in args.workers:
+            library.entries = {}
+            start = time.perf_counter()
+            library.refresh(workers=workers)
+            elapsed = time.perf_counter() - start
+            print(f"build, {workers} workers: {elapsed:.2f} s ({args.files / elapsed:.0f} files/s)")
+
+        refresh, _ = best_of(library.refresh)
+        print(f"refresh, nothing changed: {refresh * 1e3:.1f} ms")
+        load, library = best_of(lambda: CarrierLibrary(directory))
+        print(f"load index ({os.path.getsize(library.index_path)} bytes): {load * 1e3:.1f} ms")
+
+        rng = random.Random(1)
+        lengths = [rng.randint(100, args.max_size) for _ in range(args.picks)]
+        for randomize in (False, True):
+            start = time.perf_counter()
+            for length in lengths:
+                library.pick(length, randomize=randomize)
+            elapsed = time.perf_counter() - start
+            print(f"pick{' (random)' if randomize else ''}: {elapsed / args.picks * 1e6:.1f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""Peak RSS and wall time of encode/decode with an in-memory carrier versus a memory-mapped one."""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from textmap import MnemonicEncoder
+from textmap.carrier import MappedCarrier
+from .common import write_carrier_file
+
+SECRET = 'correct horse battery staple'
+
+# Each measurement runs in a fresh interpreter so ru_maxrss reflects only that run
+SCRIPT = """
+import sys
+from textmap import MnemonicEncoder
+from textmap.carrier import MappedCarrier, TextCarrier
+
+operation, mode, path, key = sys.argv[1:5]
+encoder = MnemonicEncoder()
+if mode == 'text':
+    with open(path, 'r', encoding='utf-8') as f:
+        carrier = TextCarrier(f.read())
+else:
+    carrier = MappedCarrier(path)
+if operation == 'encode':
+    encoder.encode_key(%r, carrier)
+else:
+    print(encoder.decode(carrier, key), end='')
+""" % SECRET
+
+
+def measure(operation: str, mode: str, path: str, key: str):
+    """Return (seconds, peak RSS in MB, stdout) for one operation in a child process."""
+    env = dict(os.environ, PYTHONPATH=os.getcwd())
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', SCRIPT, operation, mode, path, key],
+                            check=True, env=env, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    # ru_maxrss of children is the largest of all waited-for children, so measure in order of size
+    peak_kb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return elapsed, peak_kb / 1024, result.stdout
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes-mb', type=int, nargs='+', default=[10, 50, 100, 200])
+    parser.add_argument('--operations', nargs='+', choices=['encode', 'decode'], default=['decode', 'encode'])
+    args = parser.parse_args()
+
+    print(f"{'operation':>9} {'file MB':>8} {'mode':>7} {'seconds':>8} {'peak RSS MB':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        keys = {}
+        for size_mb in sorted(args.sizes_mb):
+            path = os.path.join(tmp, f'carrier-{size_mb}.txt')
+            write_carrier_file(path, size_mb * 1_000_000)
+            with MappedCarrier(path) as carrier:
+                keys[size_mb] = MnemonicEncoder(key_version='v3').encode_key(SECRET, carrier)
+
+        for operation in args.operations:
+            for mode in ('mapped', 'text'):
+                for size_mb in sorted(args.sizes_mb):
+                    path = os.path.join(tmp, f'carrier-{size_mb}.txt')
+                    elapsed, peak, output = measure(operation, mode, path, keys[size_mb])
+                    if operation == 'decode' and output != SECRET:
+                        raise SystemExit(f"{mode} decode returned {output!r}")
+                    print(f"{operation:>9} {size_mb:>8} {mode:>7} {elapsed:>8.2f} {peak:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+"""Time position mapping for each key version across secret/carrier density ratios."""
+import argparse
+import secrets
+
+from textmap import MnemonicEncoder
+from .common import best_of, quiet_logging
+
+DENSITIES = [0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 1.0]
+
+
+def run(text_length: int, versions, repeat: int) -> None:
+    encoder = MnemonicEncoder()
+    main_key = secrets.token_hex(32)
+
+    print(f"carrier content length {text_length}")
+    print(f"{'density':>8} " + ' '.join(f"{version + ' s':>10} {version + ' us/pos':>11}" for version in versions))
+    for density in DENSITIES:
+        count = max(1, int(text_length * density))
+        cells = []
+        for version in versions:
+            elapsed, _ = best_of(lambda: encoder._positions_for(version, text_length, count, main_key), repeat)
+            cells.append(f"{elapsed:>10.4f} {elapsed / count * 1e6:>11.2f}")
+        print(f"{density:>8.0%} " + ' '.join(cells))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--text-length', type=int, default=20_000)
+    parser.add_argument('--versions', nargs='+', default=sorted(MnemonicEncoder.KEY_VERSIONS))
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    quiet_logging()
+    run(args.text_length, args.versions, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
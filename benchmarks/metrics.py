@@ -0,0 +1,40 @@
+"""Encode and decode throughput without metrics versus with a MetricsCollector attached."""
+import argparse
+
+from textmap import MnemonicEncoder, TextCarrier
+from textmap.metrics import MetricsCollector
+from .common import best_of, make_carrier, make_secret, quiet_logging
+
+
+def run(carrier_size: int, secret_length: int, operations: int, repeat: int) -> None:
+    carrier = TextCarrier(make_carrier(carrier_size))
+    secret = make_secret(secret_length)
+    key = MnemonicEncoder().encode_key(secret, carrier)
+
+    print(f"{operations} operations, {carrier_size} char carrier, {secret_length} char secret")
+    for name, operation in (('encode', lambda encoder: encoder.encode_key(secret, carrier)),
+                            ('decode', lambda encoder: encoder.decode(carrier, key))):
+        plain = MnemonicEncoder()
+        metrics = MetricsCollector()
+        instrumented = MnemonicEncoder(metrics=metrics)
+
+        off, _ = best_of(lambda: [operation(plain) for _ in range(operations)], repeat)
+        on, _ = best_of(lambda: [operation(instrumented) for _ in range(operations)], repeat)
+        print(f"{name}: {off / operations * 1e6:>8.1f} us without metrics, "
+              f"{on / operations * 1e6:>8.1f} us with metrics ({(on / off - 1):+.1%})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--carrier-size', type=int, default=10_000)
+    parser.add_argument('--secret-length', type=int, default=100)
+    parser.add_argument('--operations', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    quiet_logging()
+    run(args.carrier_size, args.secret_length, args.operations, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""Compare TextProcessor.normalize_text against the original per-character loop."""
+import argparse
+
+from textmap.text_processor import TextProcessor
+from .common import best_of, make_carrier
+
+SIZES = {'1KB': 1_000, '1MB': 1_000_000, '100MB': 100_000_000}
+
+
+def legacy_normalize_text(text: str) -> str:
+    """The per-character loop normalize_text used before the byte-table engine."""
+    if not text:
+        return ""
+    normalized_chars = []
+    for char in text:
+        if char in TextProcessor.VALID_CHARS:
+            normalized_chars.append(char)
+        else:
+            normalized_chars.append(' ')
+    return ''.join(normalized_chars)
+
+
+def run(sizes, non_ascii: bool, repeat: int) -> None:
+    print(f"{'size':>6} {'input':>9} {'loop s':>9} {'engine s':>9} {'speedup':>8}")
+    for label in sizes:
+        text = make_carrier(SIZES[label])
+        if non_ascii:
+            # Sprinkle in accented letters, dashes and emoji
+            text = text.replace('quick', 'quïck').replace(' - ', ' — ').replace('dog', 'dog\U0001F415')
+        loop_time, expected = best_of(lambda: legacy_normalize_text(text), repeat)
+        engine_time, result = best_of(lambda: TextProcessor.normalize_text(text), repeat)
+        if result != expected:
+            raise SystemExit(f"normalize_text output differs from the loop for {label}")
+        kind = 'unicode' if non_ascii else 'ascii'
+        print(f"{label:>6} {kind:>9} {loop_time:>9.4f} {engine_time:>9.4f} {loop_time / engine_time:>7.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZES), default=list(SIZES))
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    run(args.sizes, non_ascii=False, repeat=args.repeat)
+    run(args.sizes, non_ascii=True, repeat=args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Offset computation and recovery time across secret lengths, against the per-character loops."""
+import argparse
+
+from textmap import MnemonicEncoder, TextCarrier
+from .common import best_of, make_carrier, make_secret, quiet_logging
+
+SPACE_MARKER = MnemonicEncoder.SPACE_MARKER
+
+
+def legacy_offsets(mnemonic: str, base_chars) -> str:
+    """Offsets as built before, one Python int per character, serialized per offset."""
+    offsets = []
+    pos_idx = 0
+    for target_char in mnemonic:
+        if target_char.isspace():
+            offsets.append(SPACE_MARKER)
+        else:
+            offsets.append((ord(target_char) - ord(base_chars[pos_idx])) % 255)
+            pos_idx += 1
+    return ''.join(f"{offset:02x}" for offset in offsets)
+
+
+def legacy_recover(offsets_hex: str, base_chars) -> str:
+    """Recovery as done before: parse ints, then one string per character."""
+    offsets = [int(offsets_hex[i:i+2], 16) for i in range(0, len(offsets_hex), 2)]
+    result = []
+    pos_idx = 0
+    for offset in offsets:
+        if offset == SPACE_MARKER:
+            result.append(' ')
+        else:
+            result.append(chr((ord(base_chars[pos_idx]) + offset) % 255))
+            pos_idx += 1
+    return ''.join(result)
+
+
+def run(secret_lengths, carrier_size: int, repeat: int) -> None:
+    carrier = TextCarrier(make_carrier(carrier_size))
+    encoder = MnemonicEncoder()
+
+    # Offset arithmetic and serialization only; deriving positions is the same for both
+    print(f"{'secret':>8} {'legacy enc ms':>14} {'encode ms':>10} {'legacy dec ms':>14} {'decode ms':>10}")
+    for length in secret_lengths:
+        secret = make_secret(length)
+        content_count = len(secret) - secret.count(' ')
+        base_chars = carrier.chars_at(range(content_count))
+        base_bytes = ''.join(base_chars).encode('ascii')
+
+        legacy_encode, legacy_hex = best_of(lambda: legacy_offsets(secret, base_chars), repeat)
+        encode, offsets_hex = best_of(
+            lambda: encoder._offsets_for(secret.encode('ascii'), base_bytes).hex(), repeat)
+        legacy_decode, legacy_decoded = best_of(lambda: legacy_recover(legacy_hex, base_chars), repeat)
+        decode, decoded = best_of(
+            lambda: encoder._apply_offsets(bytes.fromhex(offsets_hex), base_bytes), repeat)
+        if offsets_hex != legacy_hex or decoded != legacy_decoded or decoded != secret:
+            raise SystemExit("offsets differ from the per-character implementation")
+
+        print(f"{length:>8} {legacy_encode * 1e3:>14.2f} {encode * 1e3:>10.2f} "
+              f"{legacy_decode * 1e3:>14.2f} {decode * 1e3:>10.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--secret-lengths', type=int, nargs='+',
+                        default=[100, 1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument('--carrier-size', type=int, default=2_000_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    quiet_logging()
+    run(args.secret_lengths, args.carrier_size, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
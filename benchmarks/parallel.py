@@ -0,0 +1,63 @@
+"""
+Carrier preparation on one process versus a process pool: TextCarrier
+normalization and validation, and the MappedCarrier index and validation scans,
+for each worker count.
+"""
+import argparse
+import os
+import tempfile
+
+from textmap import carrier as carrier_module
+from textmap.carrier import MappedCarrier, TextCarrier
+from .common import best_of, make_carrier, quiet_logging, write_carrier_file
+
+
+def prepare_text(text: str, workers: int) -> TextCarrier:
+    carrier = TextCarrier(text, workers=workers)
+    carrier.stats
+    return carrier
+
+
+def prepare_file(path: str, workers: int) -> None:
+    with MappedCarrier(path, use_index=False, workers=workers) as carrier:
+        carrier.stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=256_000_000, help='Carrier size in bytes')
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    quiet_logging()
+    # Measure the pool at every size given, not just above the library default
+    carrier_module.PARALLEL_MIN_SIZE = 0
+    print(f"{args.size} byte carrier, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8} {'text s':>8} {'speedup':>8} {'file s':>8} {'speedup':>8}")
+
+    text = make_carrier(args.size)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'carrier.txt')
+        write_carrier_file(path, args.size)
+
+        baseline = None
+        expected = None
+        for workers in args.workers:
+            text_time, carrier = best_of(lambda: prepare_text(text, workers), args.repeat)
+            file_time, _ = best_of(lambda: prepare_file(path, workers), args.repeat)
+            if expected is None:
+                expected = (carrier.content, carrier.stats)
+            elif (carrier.content, carrier.stats) != expected:
+                raise SystemExit(f"{workers} workers prepared a different carrier")
+            del carrier
+
+            if baseline is None:
+                baseline = (text_time, file_time)
+            print(f"{workers:>8} {text_time:>8.2f} {baseline[0] / text_time:>7.2f}x "
+                  f"{file_time:>8.2f} {baseline[1] / file_time:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+"""
+Latency of `textmap serve` requests against per-invocation CLI cost: persistent
+connection latency for cached carriers, throughput with concurrent clients, and
+the wall time of `textmap client` versus `textmap decode` processes.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from textmap import MnemonicEncoder
+from textmap.carrier import MappedCarrier
+from textmap.client import Client
+from .common import make_carrier, make_secret, quiet_logging, write_carrier_file
+
+# The checkout holding the textmap package, so runs use the code being measured
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def cli_env() -> Dict[str, str]:
+    env = {name: value for name, value in os.environ.items() if name != 'PYTHONDONTWRITEBYTECODE'}
+    env['PYTHONPATH'] = str(ROOT)
+    return env
+
+
+def start_server(socket_path: str) -> subprocess.Popen:
+    """Start `textmap serve` and wait until it answers."""
+    process = subprocess.Popen([sys.executable, '-m', 'textmap.cli', 'serve', '--socket', socket_path],
+                               env=cli_env(), stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            with Client(socket_path) as client:
+                if client.request({'op': 'ping'})['ok']:
+                    return process
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise SystemExit("textmap serve did not start")
+
+
+def latencies(client: Client, request: Dict[str, object], count: int) -> List[float]:
+    """Seconds per request over one connection, after a warm-up request."""
+    client.request(request)
+    times = []
+    for _ in range(count):
+        start = time.perf_counter()
+        reply = client.request(request)
+        times.append(time.perf_counter() - start)
+        if not reply['ok']:
+            raise SystemExit(f"Request failed: {reply['error']}")
+    return sorted(times)
+
+
+def percentile(times: List[float], fraction: float) -> float:
+    return times[min(len(times) - 1, int(len(times) * fraction))]
+
+
+def concurrent_throughput(socket_path: str, request: Dict[str, object], clients: int, count: int) -> float:
+    """Requests per second with several clients, each on its own connection."""
+    def worker() -> None:
+        with Client(socket_path) as client:
+            for _ in range(count):
+                client.request(request)
+
+    threads = [threading.Thread(target=worker) for _ in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return clients * count / (time.perf_counter() - start)
+
+
+def process_time(args: List[str], repeat: int) -> float:
+    """Best wall time of a textmap process."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-m', 'textmap.cli', *args], env=cli_env(),
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=10_000_000, help='Carrier file size in bytes')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--clients', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    quiet_logging()
+    with tempfile.TemporaryDirectory() as tmp:
+        carrier_path = os.path.join(tmp, 'carrier.txt')
+        write_carrier_file(carrier_path, args.size)
+        text = make_carrier(10_000)
+        secret = make_secret(60)
+        encoder = MnemonicEncoder()
+        key = encoder.encode_key(secret, text)
+        with MappedCarrier(carrier_path) as carrier:
+            file_key = encoder.encode_key(secret, carrier)
+
+        socket_path = os.path.join(tmp, 'textmap.sock')
+        server = start_server(socket_path)
+        try:
+            requests = [
+                ('decode, file carrier', {'op': 'decode', 'text_file': carrier_path, 'key': file_key}),
+                ('decode, inline text', {'op': 'decode', 'text': text, 'key': key}),
+                ('encode, inline text', {'op': 'encode', 'text': text, 'mnemonic': secret}),
+                ('ping', {'op': 'ping'}),
+            ]
+            print(f"{args.requests} requests per case, {args.size} byte carrier file")
+            print(f"{'request':>22} {'p50 us':>8} {'p99 us':>8}")
+            with Client(socket_path) as client:
+                for name, request in requests:
+                    times = latencies(client, request, args.requests)
+                    print(f"{name:>22} {percentile(times, 0.5) * 1e6:>8.1f} {percentile(times, 0.99) * 1e6:>8.1f}")
+
+            print(f"\n{'clients':>8} {'requests/s':>11}")
+            for clients in args.clients:
+                rate = concurrent_throughput(socket_path, requests[0][1], clients, args.requests // clients)
+                print(f"{clients:>8} {rate:>11.0f}")
+
+            client_process = process_time(['client', '--socket', socket_path, 'decode',
+                                           '-t', carrier_path, '-k', file_key], args.repeat)
+            cli_process = process_time(['decode', '-t', carrier_path, '-k', file_key], args.repeat)
+            print(f"\ntextmap client decode: {client_process * 1e3:.1f} ms per process")
+            print(f"textmap decode:        {cli_process * 1e3:.1f} ms per process")
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
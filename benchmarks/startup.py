@@ -0,0 +1,131 @@
+"""
+CLI startup budget: import cost and wall time of `textmap` subcommands, measured
+with `python -X importtime` in fresh interpreters. Exits with status 1 if a
+subcommand imports more than the budget allows, or loads a module it does not need.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from textmap import MnemonicEncoder
+from .common import make_secret, quiet_logging, write_carrier_file
+
+# The checkout holding the textmap package, so runs use the code being measured
+ROOT = Path(__file__).resolve().parent.parent
+
+# Import time per subcommand. Eager imports took about 55 ms; the lazy ones
+# measure 24-28 ms, rising to about 38 ms when the machine is busy, which the
+# budget still has to allow for
+DEFAULT_BUDGET_MS = 45.0
+
+# Runs the CLI the way the installed `textmap` console script does
+ENTRY_POINT = "import sys; from textmap.cli import main; sys.argv[0] = 'textmap'; sys.exit(main())"
+
+# Modules that only other subcommands (or options) need
+HEAVY_MODULES = ['textmap.batch', 'textmap.metrics', 'textmap.gui', 'tkinter', 'concurrent.futures',
+                 'multiprocessing', 'json', 'csv', 'logging', 'pathlib']
+
+
+def cli_env() -> Dict[str, str]:
+    """Environment for CLI runs; bytecode caching stays on, as for an installed package."""
+    env = {name: value for name, value in os.environ.items() if name != 'PYTHONDONTWRITEBYTECODE'}
+    env['PYTHONPATH'] = str(ROOT)
+    return env
+
+
+def import_times(args: List[str], workdir: str) -> Dict[str, int]:
+    """Run python with -X importtime and return the cumulative microseconds of top-level imports."""
+    process = subprocess.run([sys.executable, '-X', 'importtime', *args], env=cli_env(), cwd=workdir,
+                             stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    if process.returncode:
+        raise SystemExit(f"{' '.join(args)} failed:\n{process.stderr}")
+
+    imports = {}
+    for line in process.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package", nested imports are indented
+        if not line.startswith('import time:') or line.endswith('imported package'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        name = name[1:]
+        imports[name.strip()] = 0 if name.startswith(' ') else int(cumulative)
+    return imports
+
+
+def measure(commands: List[List[str]], workdir: str, repeat: int,
+            baseline: Dict[str, int]) -> List[Tuple[float, float, List[str]]]:
+    """
+    Return (import ms, wall ms, modules) for each CLI run, best of repeat. The
+    commands take turns, so a slow spell on the machine hits all of them alike
+    rather than skewing whichever one happened to be running.
+    """
+    best = [[float('inf'), float('inf'), []] for _ in commands]
+    for _ in range(repeat):
+        for args, result in zip(commands, best):
+            start = time.perf_counter()
+            imports = import_times(['-c', ENTRY_POINT, *args], workdir)
+            result[1] = min(result[1], time.perf_counter() - start)
+            # Imports the bare interpreter makes anyway are not the CLI's cost
+            cost = sum(cumulative for name, cumulative in imports.items() if name not in baseline)
+            result[0] = min(result[0], cost / 1e3)
+            result[2] = list(imports)
+    return [(import_ms, wall * 1e3, modules) for import_ms, wall, modules in best]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                        help='Allowed import time per subcommand in milliseconds')
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    quiet_logging()
+    with tempfile.TemporaryDirectory() as workdir:
+        carrier_path = os.path.join(workdir, 'carrier.txt')
+        write_carrier_file(carrier_path, 100_000)
+        secret = make_secret(60)
+        key = MnemonicEncoder().encode_key(secret, open(carrier_path, encoding='utf-8').read())
+
+        # (name, arguments, modules that must not be imported)
+        commands = [
+            ('help', ['--help'], HEAVY_MODULES + ['base64']),
+            ('encode', ['encode', '-t', carrier_path, '-m', secret, '-o', 'encoded.txt', '-k', 'key.txt'],
+             HEAVY_MODULES),
+            ('decode', ['decode', '-t', carrier_path, '-k', key], HEAVY_MODULES + ['base64']),
+            ('convert-key', ['convert-key', '-k', key, '--to', 'binary'], HEAVY_MODULES),
+            ('index', ['index', carrier_path], HEAVY_MODULES + ['base64']),
+            # The client only talks to a server, so it must not load the encoder either
+            ('client', ['client', '--help'],
+             [module for module in HEAVY_MODULES if module != 'json'] +
+             ['base64', 'textmap.encoder', 'textmap.carrier', 'asyncio']),
+        ]
+
+        # Warm up the bytecode cache before measuring
+        import_times(['-c', ENTRY_POINT, '--help'], workdir)
+        baseline = import_times(['-c', 'pass'], workdir)
+
+        failures = []
+        print(f"{'command':>12} {'import ms':>10} {'wall ms':>8}")
+        results = measure([command for _, command, _ in commands], workdir, args.repeat, baseline)
+        for (name, _, forbidden), (import_ms, wall_ms, modules) in zip(commands, results):
+            print(f"{name:>12} {import_ms:>10.1f} {wall_ms:>8.1f}")
+            if import_ms > args.budget_ms:
+                failures.append(f"{name}: imports take {import_ms:.1f} ms, budget is {args.budget_ms:.1f} ms")
+            unexpected = sorted(module for module in modules if module in forbidden)
+            if unexpected:
+                failures.append(f"{name}: imports {', '.join(unexpected)}")
+
+    if failures:
+        print("\nStartup budget exceeded:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("\nWithin budget")
+
+
+if __name__ == '__main__':
+    main()
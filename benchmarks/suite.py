@@ -0,0 +1,202 @@
+"""
+Benchmark suite: per-stage timings and peak memory of the text processor and
+encoder across carrier sizes and secret densities, plus `textmap encode` and
+`textmap decode` wall time measured in fresh interpreters.
+"""
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from textmap import MnemonicEncoder, TextCarrier, __version__
+from textmap.text_processor import TextProcessor
+from .common import make_carrier, make_secret, quiet_logging, write_carrier_file
+
+DEFAULT_SIZES = [10_000, 1_000_000, 10_000_000]
+# Secret length as a fraction of the carrier's content characters
+DEFAULT_DENSITIES = [0.001, 0.01, 0.1]
+# Regressions smaller than this fraction are treated as noise by compare
+DEFAULT_THRESHOLD = 0.10
+
+CLI_SECRET = 'abandon ability able about above absent absorb abstract absurd abuse access accident'
+
+# The checkout holding the textmap package, so CLI runs use the code being measured
+ROOT = Path(__file__).resolve().parent.parent
+
+Case = Tuple[str, Optional[float], Callable[[], object]]
+
+
+def time_stage(func: Callable[[], object], repeat: int) -> float:
+    """Best seconds per call, looping fast stages until each measurement takes 0.2s."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def peak_memory(func: Callable[[], object]) -> int:
+    """Peak bytes allocated by Python while func runs."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def stage_cases(size: int, densities: List[float]) -> Iterator[Case]:
+    """Yield (stage, density, func) for one carrier size; density is None for carrier-only stages."""
+    text = make_carrier(size, seed=size)
+    content = TextProcessor.extract_content(text)
+    carrier = TextCarrier(text)
+
+    yield 'normalize_text', None, lambda: TextProcessor.normalize_text(text)
+    yield 'validate_text_source', None, lambda: TextProcessor.validate_text_source(text)
+    yield 'format_output', None, lambda: TextProcessor.format_output(content)
+    yield 'prepare_carrier', None, lambda: TextCarrier(text)
+
+    encoder = MnemonicEncoder()
+    for density in densities:
+        secret = make_secret(max(24, int(len(content) * density)), seed=size)
+        key = encoder.encode_key(secret, carrier)
+        _, _, main_key, offsets = encoder._extract_key_parts(key)
+        count = len(offsets) - offsets.count(encoder.SPACE_MARKER)
+
+        for version in sorted(MnemonicEncoder.KEY_VERSIONS):
+            yield (f'mapping_{version}', density,
+                   lambda version=version: encoder._positions_for(version, len(carrier), count, main_key))
+        yield 'parse_key', density, lambda key=key: encoder._extract_key_parts(key)
+        yield 'encode', density, lambda secret=secret: encoder.encode_key(secret, text)
+        yield 'decode', density, lambda key=key: encoder.decode(text, key)
+
+
+def run_cli(args: List[str], workdir: str) -> Tuple[float, int, str]:
+    """Run the textmap CLI in a fresh interpreter; return (seconds, peak RSS bytes, stdout)."""
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    stdout_path = os.path.join(workdir, 'stdout')
+    with open(stdout_path, 'wb') as stdout:
+        start = time.perf_counter()
+        process = subprocess.Popen([sys.executable, '-m', 'textmap.cli', *args], env=env,
+                                   stdout=stdout, stderr=subprocess.DEVNULL)
+        # wait4 reports the resource usage of this child alone
+        _, status, usage = os.wait4(process.pid, 0)
+        elapsed = time.perf_counter() - start
+    # Reaped by wait4, so the Popen object must not wait for it again
+    process.returncode = status
+    if status:
+        raise SystemExit(f"textmap {args[0]} failed (wait status {status})")
+
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak = usage.ru_maxrss if sys.platform == 'darwin' else usage.ru_maxrss * 1024
+    with open(stdout_path, 'r', encoding='utf-8') as f:
+        return elapsed, peak, f.read()
+
+
+def cli_cases(size: int, workdir: str, repeat: int) -> Iterator[Dict[str, object]]:
+    """Time `textmap encode` and `textmap decode` on a carrier file, including startup."""
+    carrier_path = os.path.join(workdir, f'carrier-{size}.txt')
+    encoded_path = os.path.join(workdir, f'encoded-{size}.txt')
+    key_path = os.path.join(workdir, f'key-{size}.txt')
+    write_carrier_file(carrier_path, size, seed=size)
+
+    runs = [run_cli(['encode', '-t', carrier_path, '-m', CLI_SECRET, '-o', encoded_path, '-k', key_path], workdir)
+            for _ in range(repeat)]
+    yield {'stage': 'cli_encode', 'seconds': min(run[0] for run in runs), 'peak_bytes': min(run[1] for run in runs)}
+
+    with open(key_path, 'r', encoding='utf-8') as f:
+        key = f.read().strip()
+    runs = [run_cli(['decode', '-t', encoded_path, '-k', key], workdir) for _ in range(repeat)]
+    if runs[0][2].strip() != CLI_SECRET:
+        raise SystemExit("textmap decode did not recover the secret")
+    yield {'stage': 'cli_decode', 'seconds': min(run[0] for run in runs), 'peak_bytes': min(run[1] for run in runs)}
+
+
+def run_suite(sizes: List[int], densities: List[float], repeat: int,
+              measure_memory: bool = True, cli: bool = True) -> Dict[str, object]:
+    """Run every stage and return the results document."""
+    quiet_logging()
+    results = []
+
+    def record(result: Dict[str, object]) -> None:
+        results.append(result)
+        density = '-' if result['density'] is None else f"{result['density']:.3%}"
+        peak = '-' if result['peak_bytes'] is None else f"{result['peak_bytes'] / 1024:.0f}"
+        print(f"{result['stage']:>22} {result['size']:>10} {density:>8} "
+              f"{result['seconds'] * 1e3:>11.3f} {peak:>10}", flush=True)
+
+    print(f"{'stage':>22} {'size':>10} {'density':>8} {'ms':>11} {'peak KB':>10}")
+    for size in sizes:
+        for stage, density, func in stage_cases(size, densities):
+            record({'stage': stage, 'size': size, 'density': density, 'seconds': time_stage(func, repeat),
+                    'peak_bytes': peak_memory(func) if measure_memory else None})
+
+    if cli:
+        with tempfile.TemporaryDirectory() as workdir:
+            for size in sizes:
+                for result in cli_cases(size, workdir, repeat):
+                    record({'size': size, 'density': None, **result})
+
+    return {
+        'meta': {
+            'textmap': __version__,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def _result_id(result: Dict[str, object]) -> Tuple[str, int, Optional[float]]:
+    return result['stage'], result['size'], result['density']
+
+
+def compare(baseline: Dict[str, object], current: Dict[str, object],
+            threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """
+    Print how current differs from baseline and return the regressions: results
+    that are slower, or peak higher, than the baseline by more than threshold.
+    """
+    base_results = {_result_id(result): result for result in baseline['results']}
+    regressions = []
+
+    print(f"{'stage':>22} {'size':>10} {'density':>8} {'time':>8} {'memory':>8}")
+    for result in current['results']:
+        base = base_results.get(_result_id(result))
+        if base is None:
+            continue
+
+        changes = []
+        for metric in ('seconds', 'peak_bytes'):
+            if not base[metric] or result[metric] is None:
+                changes.append(None)
+                continue
+            ratio = result[metric] / base[metric]
+            changes.append(ratio)
+            if ratio > 1 + threshold:
+                regressions.append(f"{result['stage']} size={result['size']} density={result['density']}: "
+                                   f"{metric} {ratio:.2f}x baseline")
+
+        density = '-' if result['density'] is None else f"{result['density']:.3%}"
+        time_change, memory_change = ('-' if change is None else f"{change:.2f}x" for change in changes)
+        print(f"{result['stage']:>22} {result['size']:>10} {density:>8} {time_change:>8} {memory_change:>8}")
+
+    return regressions
+
+
+def load_results(path: str) -> Dict[str, object]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_results(document: Dict[str, object], path: str) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2)
+        f.write('\n')
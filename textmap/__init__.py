@@ -1,4 +1,22 @@
-from .encoder import MnemonicEncoder
-
 __version__ = '0.1.0'
-__all__ = ['MnemonicEncoder']
\ No newline at end of file
+__all__ = ['AsyncMnemonicEncoder', 'CarrierCache', 'MnemonicEncoder', 'TextCarrier']
+
+# Public names are imported on first access, so `import textmap` (and every
+# CLI run) only pays for the modules it actually uses
+_LAZY_IMPORTS = {
+    'AsyncMnemonicEncoder': 'aio',
+    'CarrierCache': 'carrier',
+    'TextCarrier': 'carrier',
+    'MnemonicEncoder': 'encoder',
+}
+
+def __getattr__(name):
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(f'.{_LAZY_IMPORTS[name]}', __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
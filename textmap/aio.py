@@ -0,0 +1,183 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import AsyncIterable, Dict, Optional, Tuple, Union
+from .carrier import STREAM_CHUNK_SIZE, Carrier, CarrierCache, MappedCarrier
+from .encoder import MnemonicEncoder
+
+# Async byte streams: anything with an awaitable read(size), such as
+# asyncio.StreamReader or an aiohttp request body, or an async iterable of bytes
+AsyncByteStream = Union[AsyncIterable[bytes], asyncio.StreamReader]
+
+class _Cancelled(Exception):
+    """Raised from a worker's progress callback once its job has been cancelled."""
+
+class _SpooledFile:
+    """A stream carrier spooled to a temporary file, opened by the worker itself."""
+    __slots__ = ('path',)
+
+    def __init__(self, path: str):
+        self.path = path
+
+def _run_job(options: Dict[str, object], operation: str, source: Union[str, Carrier, _SpooledFile],
+             argument: str, cancelled: Optional[threading.Event]) -> Union[str, Tuple[str, str]]:
+    """Run one encode_key, encode or decode in a worker thread or process."""
+    progress = None
+    if cancelled is not None:
+        if cancelled.is_set():
+            raise _Cancelled()
+
+        def progress(stage: str, done: int, total: int) -> None:
+            if cancelled.is_set():
+                raise _Cancelled()
+
+    encoder = MnemonicEncoder(progress=progress, **options)
+
+    def run(carrier: Union[str, Carrier]) -> Union[str, Tuple[str, str]]:
+        if operation == 'decode':
+            return encoder.decode(carrier, argument)
+        return getattr(encoder, operation)(argument, carrier)
+
+    if isinstance(source, _SpooledFile):
+        with MappedCarrier(source.path, use_index=False, progress=progress) as carrier:
+            return run(carrier)
+    return run(source)
+
+def _remove(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+class AsyncMnemonicEncoder:
+    """
+    asyncio front end to MnemonicEncoder for use inside async services.
+
+    Each call runs on an executor so carrier scans never block the event loop,
+    and at most max_concurrency calls run at once; further calls wait their
+    turn. Carriers can be raw text, prepared carriers (thread executors only)
+    or async byte streams, which are spooled to a temporary file in chunks and
+    memory-mapped rather than read into memory.
+
+    Cancelling a call cancels it at once. A job already running on a thread
+    stops at its next progress report; one already running in a worker process
+    finishes in the background and its result is dropped.
+
+    Without an executor, the encoder owns a thread pool of max_concurrency
+    threads, shut down by close() or `async with`. Pass a ProcessPoolExecutor
+    to keep scans off the interpreter lock entirely; the executor's owner shuts
+    it down.
+    """
+
+    def __init__(self, key_version: str = "v1", key_format: str = "text",
+                 cache: Optional[CarrierCache] = None, executor: Optional[Executor] = None,
+                 max_concurrency: Optional[int] = None):
+        """
+        Args:
+            key_version: Key version generated by encode
+            key_format: "text" for dash-separated hex keys, "binary" for compact base64url keys
+            cache: Optional carrier cache shared by raw-text calls (thread executors only)
+            executor: Executor running the calls (default: an owned thread pool)
+            max_concurrency: Calls running at once (default: CPU count)
+        """
+        # Fails fast on an unsupported version or format
+        MnemonicEncoder(key_version=key_version, key_format=key_format)
+        self.max_concurrency = max_concurrency or os.cpu_count() or 1
+        if self.max_concurrency <= 0:
+            raise ValueError("max_concurrency must be positive")
+        self._processes = isinstance(executor, ProcessPoolExecutor)
+        if cache is not None and self._processes:
+            raise ValueError("A carrier cache cannot be shared with worker processes")
+
+        self._options: Dict[str, object] = {'key_version': key_version, 'key_format': key_format}
+        if cache is not None:
+            self._options['cache'] = cache
+        self._executor = executor
+        self._owns_executor = executor is None
+        # Created on first use, inside the running event loop
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                                thread_name_prefix='textmap-async')
+        return self._executor
+
+    async def _spool(self, stream: AsyncByteStream) -> _SpooledFile:
+        """Copy an async byte stream to a private temporary file, one chunk at a time."""
+        import tempfile
+        fd, path = tempfile.mkstemp(prefix='textmap-', suffix='.txt')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                read = getattr(stream, 'read', None)
+                if read is not None:
+                    chunk = await read(STREAM_CHUNK_SIZE)
+                    while chunk:
+                        f.write(chunk)
+                        chunk = await read(STREAM_CHUNK_SIZE)
+                else:
+                    async for chunk in stream:
+                        f.write(chunk)
+        except BaseException:
+            _remove(path)
+            raise
+        return _SpooledFile(path)
+
+    async def _submit(self, operation: str, source: Union[str, Carrier, AsyncByteStream],
+                      argument: str) -> Union[str, Tuple[str, str]]:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+
+        async with self._slots:
+            if not isinstance(source, (str, Carrier)):
+                source = await self._spool(source)
+            elif isinstance(source, Carrier) and self._processes:
+                raise TypeError("Prepared carriers cannot be sent to worker processes; "
+                                "pass raw text or a stream")
+
+            cancelled = None if self._processes else threading.Event()
+            try:
+                job = self._get_executor().submit(_run_job, self._options, operation, source,
+                                                  argument, cancelled)
+            except BaseException:
+                if isinstance(source, _SpooledFile):
+                    _remove(source.path)
+                raise
+            if isinstance(source, _SpooledFile):
+                # The worker may still be reading the file after a cancellation
+                job.add_done_callback(lambda _, path=source.path: _remove(path))
+            result = asyncio.wrap_future(job)
+            try:
+                return await asyncio.shield(result)
+            except asyncio.CancelledError:
+                if not job.cancel() and cancelled is not None:
+                    cancelled.set()
+                # Nobody awaits the job any more; consume its outcome when it ends
+                result.add_done_callback(lambda done: done.cancelled() or done.exception())
+                raise
+
+    async def encode_key(self, mnemonic: str, text: Union[str, Carrier, AsyncByteStream]) -> str:
+        """Encode a mnemonic phrase within the provided text and return only the key."""
+        return await self._submit('encode_key', text, mnemonic)
+
+    async def encode(self, mnemonic: str, text: Union[str, Carrier, AsyncByteStream]) -> Tuple[str, str]:
+        """Encode a mnemonic phrase within the provided text; returns (formatted text, key)."""
+        return await self._submit('encode', text, mnemonic)
+
+    async def decode(self, encoded_text: Union[str, Carrier, AsyncByteStream], key: str) -> str:
+        """Decode a mnemonic phrase from encoded text using its key."""
+        return await self._submit('decode', encoded_text, key)
+
+    def close(self) -> None:
+        """Shut down the owned thread pool, waiting for running jobs."""
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def __aenter__(self) -> 'AsyncMnemonicEncoder':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        # Running jobs may still be finishing, so wait off the event loop
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
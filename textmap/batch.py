@@ -0,0 +1,146 @@
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from .carrier import MappedCarrier
+from .encoder import MnemonicEncoder
+
+# Keys decoded per worker task; each task maps its carrier file once
+DEFAULT_CHUNK_SIZE = 256
+
+# Files checked per worker task by find_carrier; small, so a match stops the scan quickly
+FIND_CHUNK_SIZE = 16
+
+def read_manifest(manifest_path: Union[str, Path]) -> List[Tuple[str, str]]:
+    """
+    Read (text_file, key) jobs from a JSONL or CSV manifest.
+
+    JSONL lines are objects with "text_file" and "key" fields. CSV files have a
+    header row with "text_file" and "key" columns. Relative text file paths are
+    resolved against the manifest's directory.
+    """
+    manifest_path = Path(manifest_path)
+    with open(manifest_path, 'r', encoding='utf-8', newline='') as f:
+        content = f.read()
+
+    if content.lstrip().startswith('{'):
+        records = []
+        for line_number, line in enumerate(content.splitlines(), 1):
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid manifest line {line_number}: {str(e)}")
+    else:
+        records = list(csv.DictReader(content.splitlines()))
+
+    jobs = []
+    for number, record in enumerate(records, 1):
+        if (not isinstance(record, dict)
+                or not isinstance(record.get('text_file'), str) or not record['text_file']
+                or not isinstance(record.get('key'), str) or not record['key']):
+            raise ValueError(f"Manifest entry {number} needs 'text_file' and 'key'")
+        jobs.append((str(manifest_path.parent / record['text_file']), record['key'].strip()))
+    return jobs
+
+def _decode_chunk(file_path: str, keys: List[str]) -> List[Tuple[bool, str]]:
+    """Decode several keys against one carrier file, reporting errors per key."""
+    encoder = MnemonicEncoder()
+    try:
+        carrier = MappedCarrier(file_path)
+    except (OSError, ValueError) as e:
+        return [(False, str(e))] * len(keys)
+
+    results = []
+    with carrier:
+        for key in keys:
+            try:
+                results.append((True, encoder.decode(carrier, key)))
+            except ValueError as e:
+                results.append((False, str(e)))
+    return results
+
+def decode_batch(jobs: Iterable[Tuple[str, str]], workers: Optional[int] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[Dict[str, object]]:
+    """
+    Decode (text_file, key) jobs across a process pool.
+
+    Jobs that share a text file are decoded together so the file is prepared
+    once per chunk of keys. Results come back in job order as dictionaries with
+    "text_file", "ok" and either "decoded" or "error".
+    """
+    jobs = list(jobs)
+    workers = workers or os.cpu_count() or 1
+
+    # text file -> indexes of its jobs, in first-seen order
+    groups: Dict[str, List[int]] = {}
+    for index, (file_path, _) in enumerate(jobs):
+        groups.setdefault(file_path, []).append(index)
+
+    tasks = []
+    for file_path, indexes in groups.items():
+        for start in range(0, len(indexes), chunk_size):
+            tasks.append((file_path, indexes[start:start + chunk_size]))
+
+    file_paths = [file_path for file_path, _ in tasks]
+    key_lists = [[jobs[index][1] for index in indexes] for _, indexes in tasks]
+
+    if workers == 1 or len(tasks) <= 1:
+        outcomes = list(map(_decode_chunk, file_paths, key_lists))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+            outcomes = list(executor.map(_decode_chunk, file_paths, key_lists))
+
+    results: List[Dict[str, object]] = [{}] * len(jobs)
+    for (file_path, indexes), task_outcomes in zip(tasks, outcomes):
+        for index, (ok, value) in zip(indexes, task_outcomes):
+            results[index] = {'text_file': file_path, 'ok': ok, 'decoded' if ok else 'error': value}
+    return results
+
+def _match_chunk(key: str, file_paths: List[str]) -> Optional[str]:
+    """Return the first file that a tagged key was made with, skipping files that are not carriers."""
+    encoder = MnemonicEncoder()
+    for file_path in file_paths:
+        try:
+            carrier = MappedCarrier(file_path)
+        except (OSError, ValueError):
+            continue
+        with carrier:
+            if encoder.matches(carrier, key):
+                return file_path
+    return None
+
+def find_carrier(key: str, file_paths: Iterable[str], workers: Optional[int] = None,
+                 chunk_size: int = FIND_CHUNK_SIZE) -> Optional[str]:
+    """
+    Find the carrier file a tagged (v4) key was made with, checking files
+    across a process pool. Scanning stops as soon as one matches; with several
+    workers that is the first match found, not necessarily the first in order.
+    Returns None if no file matches.
+    """
+    file_paths = list(file_paths)
+    workers = workers or os.cpu_count() or 1
+    chunks = [file_paths[start:start + chunk_size] for start in range(0, len(file_paths), chunk_size)]
+
+    if workers == 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            found = _match_chunk(key, chunk)
+            if found is not None:
+                return found
+        return None
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+        futures = [executor.submit(_match_chunk, key, chunk) for chunk in chunks]
+        try:
+            for future in as_completed(futures):
+                found = future.result()
+                if found is not None:
+                    return found
+        finally:
+            # Chunks not yet started are dropped; running ones finish first
+            for future in futures:
+                future.cancel()
+    return None
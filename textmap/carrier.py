@@ -0,0 +1,485 @@
+import codecs
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import threading
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_right
+from collections import Counter, OrderedDict
+from typing import TYPE_CHECKING, BinaryIO, Callable, Dict, Iterator, List, Optional, Sequence, Union
+from .text_processor import TextProcessor, TextStats, TextValidator
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+# Sidecar index files live next to the carrier as "<file>.tmidx"
+INDEX_SUFFIX = '.tmidx'
+_INDEX_MAGIC = b'TMIDX\x00\x00\x01'
+# magic, file size, file mtime (ns), SHA-256 of the file, block size, block count,
+# followed by the TextStats fields; the block index follows as little-endian uint64s
+_INDEX_HEADER = struct.Struct('<8sQQ32sIQQIQ??')
+
+# Progress callbacks receive (stage, done, total)
+ProgressCallback = Callable[[str, int, int], None]
+# Characters handled between progress reports; small enough that no single step
+# holds the interpreter long enough to stall a UI thread
+PROGRESS_STEP = 1 << 17
+
+# Bytes copied at a time when spooling a stream to a temporary file
+STREAM_CHUNK_SIZE = 1 << 20
+
+# Smallest input prepared on a process pool when workers > 1; below this,
+# starting the pool costs more than it saves
+PARALLEL_MIN_SIZE = 64 * 1024 * 1024
+
+def _use_pool(workers: int, size: int) -> bool:
+    """Whether input of the given size is prepared by textmap.parallel."""
+    if workers <= 1 or size < PARALLEL_MIN_SIZE:
+        return False
+    try:
+        from multiprocessing import shared_memory  # noqa: F401 (Python 3.8+)
+    except ImportError:
+        return False
+    return True
+
+def _in_steps(stage: str, text: str, func: Callable[[str], object],
+              progress: ProgressCallback) -> Iterator[object]:
+    """Apply func to consecutive slices of text, reporting progress after each one."""
+    total = len(text)
+    for start in range(0, total, PROGRESS_STEP):
+        yield func(text[start:start + PROGRESS_STEP])
+        progress(stage, min(start + PROGRESS_STEP, total), total)
+
+def index_path(file_path: Union[str, 'Path']) -> str:
+    """Path of the sidecar index for a carrier file."""
+    return os.fspath(file_path) + INDEX_SUFFIX
+
+class Carrier(ABC):
+    """
+    Prepared carrier text. The encoder only needs the number of content
+    characters (non-whitespace, valid), the characters at given content
+    positions and, for output, the content itself in order.
+    """
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Return the number of content characters."""
+
+    @property
+    @abstractmethod
+    def stats(self) -> TextStats:
+        """Validation statistics of the content."""
+
+    @abstractmethod
+    def chars_at(self, positions: Sequence[int]) -> List[str]:
+        """Return the content characters at the given content positions."""
+
+    @abstractmethod
+    def iter_content(self) -> Iterator[str]:
+        """Yield the content characters in order, in chunks."""
+
+    def is_suitable(self) -> bool:
+        """Check whether the carrier is suitable for secure encoding."""
+        return len(self) > 0 and TextProcessor.validate_stats(self.stats)
+
+    def close(self) -> None:
+        """Release any resources held by the carrier."""
+
+    def __enter__(self) -> 'Carrier':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+class TextCarrier(Carrier):
+    """
+    Carrier text prepared for encoding or decoding: normalized and stripped of
+    whitespace once, so repeated operations on the same text can skip that work.
+
+    With a progress callback, normalization and the later validation scan run in
+    steps and report as "normalize" and "validate" stages.
+
+    With workers > 1, text of at least PARALLEL_MIN_SIZE characters is prepared
+    in chunks on that many processes (see textmap.parallel); the result is the
+    same as the serial path. Callers on platforms that spawn rather than fork
+    processes must run this under an `if __name__ == '__main__':` guard.
+    """
+
+    def __init__(self, text: str, progress: Optional[ProgressCallback] = None, workers: int = 1):
+        self._progress = progress
+        self._workers = workers
+        if _use_pool(workers, len(text or '')):
+            from . import parallel
+            self.content = parallel.extract_content(text, workers, progress)
+        elif progress is None or not text:
+            self.content = TextProcessor.extract_content(text)
+        else:
+            self.content = ''.join(_in_steps('normalize', text, TextProcessor.extract_content, progress))
+        self._stats: Optional[TextStats] = None
+        self._suitable: Optional[bool] = None
+
+    def __len__(self) -> int:
+        return len(self.content)
+
+    @property
+    def stats(self) -> TextStats:
+        """Validation statistics of the content, computed on first use."""
+        if self._stats is None:
+            if _use_pool(self._workers, len(self.content)):
+                from . import parallel
+                counts = parallel.count_content(self.content, self._workers, self._progress)
+                self._stats = TextProcessor.stats_from_counts(counts)
+            elif self._progress is None:
+                self._stats = TextProcessor.text_stats(self.content)
+            else:
+                counts = Counter()
+                for _ in _in_steps('validate', self.content, counts.update, self._progress):
+                    pass
+                self._stats = TextProcessor.stats_from_counts(counts)
+        return self._stats
+
+    def is_suitable(self) -> bool:
+        """Check suitability, scanning only until the verdict can no longer change."""
+        if self._suitable is None:
+            if self._stats is not None or _use_pool(self._workers, len(self.content)):
+                self._suitable = super().is_suitable()
+            else:
+                content = self.content
+                validator = TextValidator(len(content))
+                for start in range(0, len(content), PROGRESS_STEP):
+                    end = min(start + PROGRESS_STEP, len(content))
+                    verdict = validator.feed(content[start:end])
+                    if self._progress is not None:
+                        self._progress('validate', end, len(content))
+                    if verdict is not None:
+                        break
+                self._suitable = validator.result()
+        return self._suitable
+
+    def chars_at(self, positions: Sequence[int]) -> List[str]:
+        content = self.content
+        return [content[pos] for pos in positions]
+
+    def iter_content(self) -> Iterator[str]:
+        yield self.content
+
+class MappedCarrier(Carrier):
+    """
+    Carrier backed by a memory-mapped UTF-8 file.
+
+    Instead of materializing the stripped text, a sparse block index records how
+    many content characters precede each fixed-size block of the file. A content
+    position is resolved by bisecting the index and stripping a single block, so
+    memory stays roughly constant however large the file is.
+
+    The index can be saved next to the file with write_index(); later opens load
+    it instead of scanning, as long as the file's size and mtime are unchanged.
+
+    With a progress callback, the index scan and the validation scan report
+    bytes read as "index" and "validate" stages.
+
+    With workers > 1, files of at least PARALLEL_MIN_SIZE bytes are scanned in
+    chunks on that many processes, each mapping the file itself.
+    """
+
+    # Bytes per index block; a multiple of the page size so scanned blocks can be released
+    BLOCK_SIZE = 1 << 16
+
+    def __init__(self, file_path: Union[str, 'Path'], block_size: int = BLOCK_SIZE,
+                 use_index: bool = True, progress: Optional[ProgressCallback] = None,
+                 workers: int = 1):
+        if block_size <= 0 or block_size % mmap.PAGESIZE:
+            raise ValueError("block_size must be a positive multiple of the page size")
+
+        self.file_path = os.fspath(file_path)
+        self.block_size = block_size
+        # Set by from_stream(); the file is removed on close
+        self._temporary = False
+        # SHA-256 of the file, known once an index has been loaded or written
+        self.digest: Optional[bytes] = None
+        self._stats: Optional[TextStats] = None
+        self._suitable: Optional[bool] = None
+        self._progress = progress
+        self._workers = workers
+
+        self._file = open(self.file_path, 'rb')
+        try:
+            file_stat = os.fstat(self._file.fileno())
+            self.size = file_stat.st_size
+            self._mtime_ns = file_stat.st_mtime_ns
+            # Empty files cannot be mapped
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+            block_starts = self._load_index() if use_index else None
+            self._block_starts = block_starts if block_starts is not None else self._build_index()
+            self.indexed = block_starts is not None
+        except Exception:
+            self.close()
+            raise
+
+    @classmethod
+    def from_stream(cls, stream: BinaryIO, block_size: int = BLOCK_SIZE,
+                    progress: Optional[ProgressCallback] = None, workers: int = 1) -> 'MappedCarrier':
+        """
+        Map a carrier read from a binary stream such as stdin. The stream is
+        copied to a private temporary file in fixed-size chunks, so input that
+        cannot be seeked or mapped is never held in memory as a whole. The
+        temporary file is removed when the carrier is closed.
+        """
+        import shutil
+        import tempfile
+        fd, path = tempfile.mkstemp(prefix='textmap-', suffix='.txt')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                shutil.copyfileobj(stream, f, STREAM_CHUNK_SIZE)
+            carrier = cls(path, block_size=block_size, use_index=False, progress=progress, workers=workers)
+        except BaseException:
+            os.unlink(path)
+            raise
+        carrier._temporary = True
+        return carrier
+
+    def close(self) -> None:
+        """Release the memory map and the underlying file."""
+        if getattr(self, '_map', None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+        if self._temporary:
+            self._temporary = False
+            os.unlink(self.file_path)
+
+    def __len__(self) -> int:
+        return self._block_starts[-1]
+
+    def _iter_blocks(self, stage: Optional[str] = None) -> Iterator[bytes]:
+        """Yield the raw file blocks in order, releasing each one after use."""
+        release = getattr(mmap, 'MADV_DONTNEED', None)
+        progress = self._progress if stage is not None else None
+        for start in range(0, self.size, self.block_size):
+            end = min(start + self.block_size, self.size)
+            yield self._map[start:end]
+            if release is not None:
+                self._map.madvise(release, start, end - start)
+            if progress is not None:
+                progress(stage, end, self.size)
+
+    def _build_index(self) -> array:
+        """Count content characters per block, checking the file is valid UTF-8."""
+        if _use_pool(self._workers, self.size):
+            from . import parallel
+            return parallel.index_file(self.file_path, self.size, self.block_size,
+                                       self._workers, self._progress)
+
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        block_starts = array('Q', [0])
+        total = 0
+
+        for block in self._iter_blocks('index'):
+            decoder.decode(block)
+            total += len(TextProcessor.extract_content_bytes(block))
+            block_starts.append(total)
+        decoder.decode(b'', final=True)
+
+        return block_starts
+
+    def _load_index(self) -> Optional[array]:
+        """Load the sidecar index, or return None if it is missing, stale or damaged."""
+        try:
+            with open(index_path(self.file_path), 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+
+        header_size = _INDEX_HEADER.size
+        if len(data) < header_size or (len(data) - header_size) % 8:
+            return None
+        (magic, size, mtime_ns, digest, block_size, block_count,
+         *stats) = _INDEX_HEADER.unpack_from(data)
+        if magic != _INDEX_MAGIC or size != self.size or mtime_ns != self._mtime_ns:
+            return None
+        if block_size <= 0 or block_size % mmap.PAGESIZE:
+            return None
+
+        block_starts = array('Q')
+        block_starts.frombytes(data[header_size:])
+        if sys.byteorder == 'big':
+            block_starts.byteswap()
+        stats = TextStats(*stats)
+        if len(block_starts) != block_count + 1 or block_starts[-1] != stats.content_length:
+            return None
+
+        self.block_size = block_size
+        self.digest = digest
+        self._stats = stats
+        return block_starts
+
+    def _file_digest(self) -> bytes:
+        digest = hashlib.sha256()
+        for block in self._iter_blocks():
+            digest.update(block)
+        return digest.digest()
+
+    def write_index(self) -> str:
+        """
+        Save the block index, the file digest and the validation statistics to
+        the sidecar file so later opens skip scanning. Returns the index path.
+        """
+        self.digest = self._file_digest()
+        stats = self.stats
+
+        block_starts = array('Q', self._block_starts)
+        if sys.byteorder == 'big':
+            block_starts.byteswap()
+        header = _INDEX_HEADER.pack(
+            _INDEX_MAGIC, self.size, self._mtime_ns, self.digest,
+            self.block_size, len(self._block_starts) - 1, *stats
+        )
+
+        path = index_path(self.file_path)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(header)
+            f.write(block_starts.tobytes())
+        os.replace(temp_path, path)
+        return path
+
+    def verify(self) -> bool:
+        """Check the file content against the digest of a loaded or written index."""
+        return self.digest is not None and self._file_digest() == self.digest
+
+    def _block_content(self, block: int) -> bytes:
+        start = block * self.block_size
+        return TextProcessor.extract_content_bytes(self._map[start:start + self.block_size])
+
+    @property
+    def stats(self) -> TextStats:
+        """Validation statistics of the content, computed by one extra scan on first use."""
+        if self._stats is None:
+            if _use_pool(self._workers, self.size):
+                from . import parallel
+                counts = parallel.count_file(self.file_path, self.size, self.block_size,
+                                             self._workers, self._progress)
+            else:
+                counts = Counter()
+                for block in self._iter_blocks('validate'):
+                    counts.update(TextProcessor.extract_content_bytes(block).decode('ascii'))
+            self._stats = TextProcessor.stats_from_counts(counts)
+        return self._stats
+
+    def is_suitable(self) -> bool:
+        """Check suitability, scanning only until the verdict can no longer change."""
+        if self._suitable is None:
+            if self._stats is not None or _use_pool(self._workers, self.size):
+                self._suitable = super().is_suitable()
+            else:
+                # Each content character is one byte of the file
+                validator = TextValidator(self.size)
+                for block in self._iter_blocks('validate'):
+                    content = TextProcessor.extract_content_bytes(block).decode('ascii')
+                    if validator.feed(content, len(block)) is not None:
+                        break
+                self._suitable = validator.result()
+        return self._suitable
+
+    def chars_at(self, positions: Sequence[int]) -> List[str]:
+        block_starts = self._block_starts
+        chars = [''] * len(positions)
+        current_block = -1
+        content = b''
+
+        # Visit positions in file order so each block is stripped at most once
+        for index in sorted(range(len(positions)), key=positions.__getitem__):
+            pos = positions[index]
+            if not 0 <= pos < len(self):
+                raise IndexError("Content position out of range")
+            block = bisect_right(block_starts, pos) - 1
+            if block != current_block:
+                current_block = block
+                content = self._block_content(block)
+            chars[index] = chr(content[pos - block_starts[block]])
+
+        return chars
+
+    def iter_content(self) -> Iterator[str]:
+        for block in self._iter_blocks():
+            content = TextProcessor.extract_content_bytes(block)
+            if content:
+                yield content.decode('ascii')
+
+class CarrierCache:
+    """
+    In-process LRU cache of prepared TextCarriers keyed by a digest of the raw
+    text, bounded both by entry count and by total content bytes. A hit skips
+    normalization and stripping, and validation once a verdict has been reached.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 256 * 1024 * 1024):
+        if max_entries <= 0 or max_bytes <= 0:
+            raise ValueError("Cache bounds must be positive")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.current_bytes = 0
+        self._entries: 'OrderedDict[bytes, TextCarrier]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def digest(text: str) -> bytes:
+        """Digest identifying a raw carrier text."""
+        return hashlib.sha256(text.encode('utf-8', 'surrogatepass')).digest()
+
+    def get(self, text: str) -> TextCarrier:
+        """Return the prepared carrier for text, preparing and caching it on a miss."""
+        digest = self.digest(text)
+        with self._lock:
+            carrier = self._entries.get(digest)
+            if carrier is not None:
+                self._entries.move_to_end(digest)
+                self.hits += 1
+                return carrier
+            self.misses += 1
+
+        # The carrier keeps its validation verdict once computed, so hits never rescan it
+        carrier = TextCarrier(text)
+        self._store(digest, carrier)
+        return carrier
+
+    def _store(self, digest: bytes, carrier: TextCarrier) -> None:
+        size = len(carrier.content)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if digest in self._entries:
+                return
+            self._entries[digest] = carrier
+            self.current_bytes += size
+            while len(self._entries) > self.max_entries or self.current_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= len(evicted.content)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all cached carriers; counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def info(self) -> Dict[str, int]:
+        """Snapshot of the cache counters and size."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+            }
@@ -1,15 +1,26 @@
 #!/usr/bin/env python3
 import argparse
+import os
 import sys
-from typing import Optional
-from .encoder import MnemonicEncoder
+from typing import TYPE_CHECKING, Iterable, Optional
 
-def read_file_or_stdin(file_path: Optional[str] = None) -> str:
-    """Read content from a file or stdin."""
+# Modules are imported where they are used: `textmap client` hands off before
+# the encoder is loaded, and a plain encode or decode skips batch, metrics,
+# json, the server and the GUI
+if TYPE_CHECKING:
+    from .carrier import Carrier
+    from .metrics import MetricsCollector
+
+def open_carrier(file_path: Optional[str] = None, workers: Optional[int] = None) -> 'Carrier':
+    """
+    Memory-map a carrier file, or stdin spooled to a temporary file in chunks.
+    Large carriers are scanned on `workers` processes (default: CPU count).
+    """
+    from .carrier import MappedCarrier
+    workers = workers or os.cpu_count() or 1
     if file_path:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return f.read()
-    return sys.stdin.read()
+        return MappedCarrier(file_path, workers=workers)
+    return MappedCarrier.from_stream(sys.stdin.buffer, workers=workers)
 
 def write_output(content: str, output_file: Optional[str] = None) -> None:
     """Write content to a file or stdout."""
@@ -19,22 +30,48 @@ def write_output(content: str, output_file: Optional[str] = None) -> None:
     else:
         print(content)
 
+def write_chunks(chunks: Iterable[str], output_file: Optional[str] = None) -> None:
+    """Write content produced piece by piece to a file or stdout."""
+    if output_file:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.writelines(chunks)
+    else:
+        sys.stdout.writelines(chunks)
+        sys.stdout.write('\n')
+
+def format_stats(metrics: 'MetricsCollector', style: str) -> str:
+    """Render collected metrics as a table, JSON or Prometheus text."""
+    if style == 'prometheus':
+        return metrics.to_prometheus().rstrip('\n')
+    snapshot = metrics.snapshot()
+    if style == 'json':
+        import json
+        return json.dumps(snapshot, indent=2)
+    
+    lines = [f"{'stage':<10} {'calls':>6} {'ms':>10} {'chars':>12}"]
+    for name, totals in snapshot['stages'].items():
+        lines.append(f"{name:<10} {totals['calls']:>6} {totals['seconds'] * 1e3:>10.3f} {totals['chars']:>12}")
+    for name, value in snapshot['counters'].items():
+        lines.append(f"{name}: {value}")
+    return '\n'.join(lines)
+
 def main() -> None:
+    # The client only talks to a running server, so it needs none of the modules below
+    if sys.argv[1:2] == ['client']:
+        from .client import main as client_main
+        client_main(sys.argv[2:])
+        return
+    
+    from .encoder import MnemonicEncoder
+    
     parser = argparse.ArgumentParser(
         description="TextMap: Securely embed and retrieve information within text."
     )
     
-     # Add gui argument before subparsers
     parser.add_argument('--gui', action='store_true', help='Launch GUI interface')
     
-    # Early check for GUI
-    args, remaining_args = parser.parse_known_args()
-    if args.gui:
-        from .gui.app import main as gui_main
-        gui_main()
-        return
-    
-    subparsers = parser.add_subparsers(dest='command', required=True)
+    # Not required at parse time so that --gui works on its own
+    subparsers = parser.add_subparsers(dest='command')
 
     # Encode command
     encode_parser = subparsers.add_parser('encode')
@@ -42,27 +79,118 @@ def main() -> None:
     encode_parser.add_argument('--mnemonic', '-m', help='Information to encode')
     encode_parser.add_argument('--output', '-o', help='Output file (default: stdout)')
     encode_parser.add_argument('--key-file', '-k', help='Key output file (default: stdout)')
+    encode_parser.add_argument('--key-version', default='v1', choices=sorted(MnemonicEncoder.KEY_VERSIONS),
+                               help='Key version to generate (default: v1)')
+    encode_parser.add_argument('--key-format', default='text', choices=MnemonicEncoder.KEY_FORMATS,
+                               help='Key format: dash-separated hex or compact base64url (default: text)')
+    
+    stats_options = dict(nargs='?', const='table', choices=['table', 'json', 'prometheus'],
+                         help='Print per-stage timings to stderr (default style: table)')
+    encode_parser.add_argument('--stats', **stats_options)
+    
+    workers_options = dict(type=int, help='Processes scanning large carriers (default: CPU count)')
+    encode_parser.add_argument('--workers', '-j', **workers_options)
 
     # Decode command
     decode_parser = subparsers.add_parser('decode')
     decode_parser.add_argument('--text-file', '-t', help='Encoded text file (or use stdin)')
     decode_parser.add_argument('--key', '-k', required=True, help='Key used for encoding')
     decode_parser.add_argument('--output', '-o', help='Output file (default: stdout)')
+    decode_parser.add_argument('--stats', **stats_options)
+    decode_parser.add_argument('--workers', '-j', **workers_options)
+    
+    # Key conversion command
+    convert_parser = subparsers.add_parser('convert-key',
+                                           help='Convert a key between the text and binary formats')
+    convert_parser.add_argument('--key', '-k', required=True, help='Key to convert')
+    convert_parser.add_argument('--to', required=True, choices=MnemonicEncoder.KEY_FORMATS,
+                                help='Target key format')
+    
+    # Index command
+    index_parser = subparsers.add_parser('index',
+                                         help='Write sidecar indexes so encode/decode skip scanning')
+    index_parser.add_argument('files', nargs='+', help='Text files to index')
+    index_parser.add_argument('--check', action='store_true',
+                              help='Verify existing indexes against the files instead of writing')
+    index_parser.add_argument('--workers', '-j', **workers_options)
+    
+    # Batch decode command
+    batch_parser = subparsers.add_parser('decode-batch',
+                                         help='Decode many text-file/key pairs in parallel')
+    batch_parser.add_argument('manifest', help='JSONL or CSV manifest with text_file and key fields')
+    batch_parser.add_argument('--output', '-o', help='JSONL results file (default: stdout)')
+    batch_parser.add_argument('--workers', '-j', type=int, help='Worker processes (default: CPU count)')
+    
+    # Carrier search command
+    find_parser = subparsers.add_parser('find-carrier',
+                                        help='Find the file a v4 key was encoded with in a directory')
+    find_parser.add_argument('directory', help='Directory of candidate carrier files')
+    find_parser.add_argument('--key', '-k', required=True, help='Key with a carrier tag (v4)')
+    find_parser.add_argument('--workers', '-j', type=int, help='Worker processes (default: CPU count)')
+    
+    # Server commands
+    serve_parser = subparsers.add_parser('serve',
+                                         help='Answer encode/decode requests on a Unix socket with warm caches')
+    serve_parser.add_argument('--socket', '-s', required=True, help='Socket path to listen on')
+    serve_parser.add_argument('--workers', '-j', type=int, help='Worker threads (default: Python default)')
+    serve_parser.add_argument('--max-open-files', type=int, default=64,
+                              help='Carrier files kept prepared between requests (default: 64)')
+    serve_parser.add_argument('--max-resident-mb', type=int, default=256,
+                              help='Content of carrier files held in memory; larger files stay '
+                                   'memory-mapped (default: 256)')
+    subparsers.add_parser('client', help='Send a request to a running server (see textmap client --help)')
+    
+    # Carrier library commands
+    library_parser = subparsers.add_parser('library',
+                                           help='Index a directory of carrier files and pick one to encode with')
+    library_subparsers = library_parser.add_subparsers(dest='library_command', required=True)
+    build_parser = library_subparsers.add_parser('build', help='Scan new and changed files into the index')
+    build_parser.add_argument('directory', help='Directory of carrier files')
+    build_parser.add_argument('--workers', '-j', type=int, help='Worker processes (default: CPU count)')
+    pick_parser = library_subparsers.add_parser('pick', help='Print the path of a suitable carrier')
+    pick_parser.add_argument('directory', help='Directory of carrier files')
+    length_group = pick_parser.add_mutually_exclusive_group(required=True)
+    length_group.add_argument('--min-length', '-n', type=int, help='Content characters the carrier needs')
+    length_group.add_argument('--mnemonic', '-m', help='Pick a carrier long enough for this secret')
+    pick_parser.add_argument('--random', action='store_true',
+                             help='Pick at random among long enough carriers instead of the shortest')
     
     args = parser.parse_args()
-    encoder = MnemonicEncoder()
+    if args.gui:
+        from .gui.app import main as gui_main
+        gui_main()
+        return
+    if args.command is None:
+        parser.error("the following arguments are required: command")
+    
+    stats = getattr(args, 'stats', None)
+    metrics = None
+    if stats:
+        from .metrics import MetricsCollector
+        metrics = MetricsCollector()
+    encoder = MnemonicEncoder(key_version=getattr(args, 'key_version', 'v1'),
+                              key_format=getattr(args, 'key_format', 'text'),
+                              metrics=metrics)
 
     try:
         if args.command == 'encode':
-            text = read_file_or_stdin(args.text_file)
-            mnemonic = args.mnemonic
-            
-            if not encoder.validate_text_source(text):
-                print("Warning: Text might not be suitable for secure encoding.", 
-                      file=sys.stderr)
-            
-            encoded_text, key = encoder.encode(mnemonic, text)
-            write_output(encoded_text, args.output)
+            from .text_processor import TextProcessor
+            # Prepare the carrier once for both validation and encoding
+            with encoder.stage('prepare'):
+                carrier = open_carrier(args.text_file, args.workers)
+            with carrier:
+                mnemonic = args.mnemonic
+                
+                with encoder.stage('validate', len(carrier)):
+                    suitable = carrier.is_suitable()
+                if not suitable:
+                    print("Warning: Text might not be suitable for secure encoding.", 
+                          file=sys.stderr)
+                
+                key = encoder.encode_key(mnemonic, carrier)
+                with encoder.stage('format', len(carrier)):
+                    formatted = TextProcessor.iter_format_output(carrier.iter_content())
+                    write_chunks(formatted, args.output)
             
             if args.key_file:
                 write_output(key, args.key_file)
@@ -70,13 +198,84 @@ def main() -> None:
                 print(f"Key: {key}", file=sys.stderr)
                 
         elif args.command == 'decode':
-            encoded_text = read_file_or_stdin(args.text_file)
-            decoded = encoder.decode(encoded_text, args.key)
+            # Files are memory-mapped; only the blocks holding mapped positions are read
+            with encoder.stage('prepare'):
+                carrier = open_carrier(args.text_file, args.workers)
+            with carrier:
+                decoded = encoder.decode(carrier, args.key)
             write_output(decoded, args.output)
             
+        elif args.command == 'convert-key':
+            print(encoder.convert_key(args.key, args.to))
+            
+        elif args.command == 'index':
+            from .carrier import MappedCarrier
+            stale = 0
+            for file_path in args.files:
+                with MappedCarrier(file_path, workers=args.workers or os.cpu_count() or 1) as carrier:
+                    if args.check:
+                        fresh = carrier.indexed and carrier.verify()
+                        stale += not fresh
+                        print(f"{file_path}: {'up to date' if fresh else 'missing or stale'}")
+                    else:
+                        path = carrier.write_index()
+                        print(f"{file_path}: {len(carrier)} content characters -> {path}")
+            if stale:
+                sys.exit(1)
+            
+        elif args.command == 'decode-batch':
+            import json
+            from .batch import decode_batch, read_manifest
+            results = decode_batch(read_manifest(args.manifest), workers=args.workers)
+            lines = [json.dumps({'index': index, **result}) for index, result in enumerate(results)]
+            write_output('\n'.join(lines), args.output)
+            
+            failed = sum(1 for result in results if not result['ok'])
+            if failed:
+                print(f"Error: {failed} of {len(results)} jobs failed", file=sys.stderr)
+                sys.exit(1)
+            
+        elif args.command == 'find-carrier':
+            from .batch import find_carrier
+            from .library import carrier_files
+            file_paths = [os.path.join(args.directory, path) for path, _ in carrier_files(args.directory)]
+            found = find_carrier(args.key, file_paths, workers=args.workers)
+            if found is None:
+                print(f"No file in {args.directory} matches the key", file=sys.stderr)
+                sys.exit(1)
+            print(found)
+            
+        elif args.command == 'library':
+            from .library import CarrierLibrary
+            library = CarrierLibrary(args.directory)
+            if args.library_command == 'build':
+                counts = library.refresh(workers=args.workers)
+                suitable = len(library.candidates(0))
+                print(f"{args.directory}: {counts['scanned']} scanned, {counts['unchanged']} unchanged, "
+                      f"{counts['removed']} removed; {suitable} of {len(library)} files suitable")
+            else:
+                min_length = args.min_length
+                if min_length is None:
+                    from .text_processor import TextProcessor
+                    min_length = sum(not char.isspace() for char in TextProcessor.normalize_text(args.mnemonic))
+                path = library.pick(min_length, randomize=args.random)
+                if path is None:
+                    raise ValueError(f"No suitable carrier with at least {min_length} content characters "
+                                     f"in {args.directory} (run `textmap library build` first)")
+                print(path)
+            
+        elif args.command == 'serve':
+            from .server import serve
+            serve(args.socket, ready=lambda: print(f"Listening on {args.socket}", file=sys.stderr),
+                  workers=args.workers, max_open_files=args.max_open_files,
+                  max_resident_bytes=args.max_resident_mb * 1024 * 1024)
+            
     except ValueError as e:
         print(f"Error: {str(e)}", file=sys.stderr)
         sys.exit(1)
+    
+    if metrics is not None:
+        print(format_stats(metrics, stats), file=sys.stderr)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,134 @@
+import argparse
+import os
+import socket
+import sys
+from typing import Dict, List, Optional
+from .protocol import HEADER, SOCKET_ENV, check_length, pack_message, unpack_payload
+
+class Client:
+    """Blocking connection to a textmap server; requests on one connection are answered in order."""
+
+    def __init__(self, socket_path: str, timeout: Optional[float] = None):
+        self.socket_path = socket_path
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.settimeout(timeout)
+        try:
+            self._socket.connect(socket_path)
+        except OSError:
+            self._socket.close()
+            raise
+
+    def _read_exactly(self, size: int) -> bytes:
+        chunks = []
+        while size:
+            chunk = self._socket.recv(min(size, 1 << 20))
+            if not chunk:
+                raise ConnectionError("Server closed the connection")
+            chunks.append(chunk)
+            size -= len(chunk)
+        return b''.join(chunks)
+
+    def request(self, message: Dict[str, object]) -> Dict[str, object]:
+        """Send one request and wait for its reply."""
+        self._socket.sendall(pack_message(message))
+        length = check_length(HEADER.unpack(self._read_exactly(HEADER.size))[0])
+        return unpack_payload(self._read_exactly(length))
+
+    def close(self) -> None:
+        self._socket.close()
+
+    def __enter__(self) -> 'Client':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+def _text_source(text_file: Optional[str]) -> Dict[str, str]:
+    """Point the server at a file by absolute path, or send stdin inline."""
+    if text_file:
+        return {'text_file': os.path.abspath(text_file)}
+    return {'text': sys.stdin.read()}
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog='textmap client',
+        description="Send encode/decode requests to a running `textmap serve`."
+    )
+    parser.add_argument('--socket', '-s', default=os.environ.get(SOCKET_ENV),
+                        help=f'Server socket path (default: ${SOCKET_ENV})')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    encode_parser = subparsers.add_parser('encode')
+    encode_parser.add_argument('--text-file', '-t', help='Source text file (or use stdin)')
+    encode_parser.add_argument('--mnemonic', '-m', required=True, help='Information to encode')
+    encode_parser.add_argument('--output', '-o', help='Output file (default: stdout)')
+    encode_parser.add_argument('--key-file', '-k', help='Key output file (default: stdout)')
+    encode_parser.add_argument('--key-version', default='v1', help='Key version to generate (default: v1)')
+    encode_parser.add_argument('--key-format', default='text', help='Key format (default: text)')
+
+    decode_parser = subparsers.add_parser('decode')
+    decode_parser.add_argument('--text-file', '-t', help='Encoded text file (or use stdin)')
+    decode_parser.add_argument('--key', '-k', required=True, help='Key used for encoding')
+    decode_parser.add_argument('--output', '-o', help='Output file (default: stdout)')
+
+    convert_parser = subparsers.add_parser('convert-key')
+    convert_parser.add_argument('--key', '-k', required=True, help='Key to convert')
+    convert_parser.add_argument('--to', required=True, choices=['text', 'binary'], help='Target key format')
+
+    subparsers.add_parser('ping', help='Check that the server is running')
+    subparsers.add_parser('stats', help='Show server request and cache counters')
+
+    args = parser.parse_args(argv)
+    if not args.socket:
+        parser.error(f"--socket is required unless ${SOCKET_ENV} is set")
+
+    if args.command == 'encode':
+        request = {'op': 'encode', 'mnemonic': args.mnemonic, 'key_version': args.key_version,
+                   'key_format': args.key_format, **_text_source(args.text_file)}
+        if args.output:
+            request['output'] = os.path.abspath(args.output)
+    elif args.command == 'decode':
+        request = {'op': 'decode', 'key': args.key, **_text_source(args.text_file)}
+    elif args.command == 'convert-key':
+        request = {'op': 'convert-key', 'key': args.key, 'to': args.to}
+    else:
+        request = {'op': args.command}
+
+    try:
+        with Client(args.socket) as client:
+            reply = client.request(request)
+    except (OSError, ValueError) as e:
+        print(f"Error: cannot reach server at {args.socket}: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+
+    if not reply.get('ok'):
+        print(f"Error: {reply.get('error')}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.command == 'encode':
+        if not reply['suitable']:
+            print("Warning: Text might not be suitable for secure encoding.", file=sys.stderr)
+        if 'encoded_text' in reply:
+            print(reply['encoded_text'])
+        if args.key_file:
+            with open(args.key_file, 'w', encoding='utf-8') as f:
+                f.write(reply['key'])
+        else:
+            print(f"Key: {reply['key']}", file=sys.stderr)
+    elif args.command == 'decode':
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write(reply['decoded'])
+        else:
+            print(reply['decoded'])
+    elif args.command == 'convert-key':
+        print(reply['key'])
+    elif args.command == 'stats':
+        for name, value in reply.items():
+            if name != 'ok':
+                print(f"{name}: {value}")
+    else:
+        print(f"textmap server {reply['version']} on {args.socket}")
+
+if __name__ == '__main__':
+    main()
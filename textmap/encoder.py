@@ -1,39 +1,125 @@
 import hashlib
-import secrets
-import logging
-from typing import Tuple, List
+import os
+import struct
+import sys
+from contextlib import closing, nullcontext
+from itertools import islice
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Optional, Sequence, Tuple, List, Union
+from .carrier import Carrier, CarrierCache, MappedCarrier, ProgressCallback, TextCarrier
 from .text_processor import TextProcessor
 
-logging.basicConfig(level=logging.DEBUG)
-logger = logging.getLogger(__name__)
+if TYPE_CHECKING:
+    from pathlib import Path
+    from .metrics import MetricsCollector
+
+# Stand-in for a metrics stage when no collector is attached
+_NO_STAGE = nullcontext()
+
+# Positions mapped between progress reports
+_MAP_PROGRESS_STEP = 1 << 12
+
+# Whitespace left in a normalized mnemonic; each one is keyed as a space marker
+_MNEMONIC_WHITESPACE = b' \t\n'
+
+def _logger():
+    """The module logger; logging is only imported once something is logged."""
+    import logging
+    return logging.getLogger(__name__)
+
+def _trace_from_env() -> Optional[Callable[[str], None]]:
+    """Return a stderr tracer when the TEXTMAP_TRACE environment switch is on."""
+    if os.environ.get('TEXTMAP_TRACE', '') in ('', '0'):
+        return None
+    return lambda message: print(f"textmap: {message}", file=sys.stderr)
 
 class MnemonicEncoder:
     # Special offset value to indicate a space (255 is unlikely to occur naturally)
     SPACE_MARKER = 255
     
-    def __init__(self):
-        self.text_processor = TextProcessor()
+    # Binary keys: "<version>b-" + unpadded base64url of the packed length, main key and offsets
+    BINARY_KEY_HEADER = struct.Struct('>I32s')
+    KEY_FORMATS = ("text", "binary")
     
-    def _strip_whitespace(self, text: str) -> str:
-        """Strip all whitespace, keeping only content characters."""
-        return ''.join(c for c in text if not c.isspace())
-        
-    def _normalize_inputs(self, text: str, mnemonic: str = None) -> tuple[str, str]:
+    # Key version -> position mapping scheme
+    KEY_VERSIONS = {
+        "v1": "_generate_mapping",
+        "v2": "_generate_shuffled_mapping",
+        "v3": "_generate_stream_mapping",
+        "v4": "_generate_stream_mapping",
+    }
+    
+    # Key versions whose offsets end with a carrier tag: a keyed fingerprint of
+    # the carrier's content length and the characters at TAG_SAMPLES positions
+    # mapped after the secret's, so decode can tell a wrong carrier from a right one
+    TAGGED_KEY_VERSIONS = ("v4",)
+    TAG_SIZE = 8
+    TAG_SAMPLES = 16
+    
+    def __init__(self, key_version: str = "v1", trace: Optional[Callable[[str], None]] = None,
+                 cache: Optional[CarrierCache] = None, key_format: str = "text",
+                 progress: Optional[ProgressCallback] = None,
+                 metrics: Optional['MetricsCollector'] = None):
         """
-        Normalize inputs differently for source text and mnemonic:
-        - Source text: Clean and strip all whitespace
-        - Mnemonic: Clean but preserve whitespace
+        Args:
+            key_version: Key version generated by encode
+            key_format: "text" for dash-separated hex keys, "binary" for compact base64url keys
+            trace: Optional callable receiving step-by-step debug messages, which
+                include secret material. Defaults to stderr when TEXTMAP_TRACE is set.
+            cache: Optional carrier cache shared by all raw-text operations
+            progress: Optional callable receiving (stage, done, total) while raw
+                text is normalized and validated and while positions are mapped.
+                An exception raised from it aborts the operation.
+            metrics: Optional collector recording per-stage timings ("prepare",
+                "normalize", "validate", "parse_key", "mapping", "offsets",
+                "format") and the hash_invocations and probe_collisions counters
         """
-        # First clean the text (replace invalid chars with spaces)
-        text = self.text_processor.normalize_text(text)
-        # Then strip all whitespace from source text for position mapping
-        text = self._strip_whitespace(text)
+        if key_version not in self.KEY_VERSIONS:
+            raise ValueError(f"Unsupported key version: {key_version}")
+        if key_format not in self.KEY_FORMATS:
+            raise ValueError(f"Unsupported key format: {key_format}")
+        self.text_processor = TextProcessor()
+        self.key_version = key_version
+        self.trace = trace if trace is not None else _trace_from_env()
+        self.cache = cache
+        self.key_format = key_format
+        self.progress = progress
+        self.metrics = metrics
+    
+    def stage(self, name: str, chars: int = 0):
+        """Context manager timing a block as a metrics stage; does nothing without a collector."""
+        if self.metrics is None:
+            return _NO_STAGE
+        return self.metrics.stage(name, chars)
+    
+    def _as_carrier(self, text: Union[str, Carrier]) -> Carrier:
+        """Prepare raw text as a carrier, passing prepared carriers through."""
+        if isinstance(text, Carrier):
+            return text
+        # Normalization and whitespace stripping are one fused pass
+        with self.stage('prepare', len(text or '')):
+            if self.cache is not None and text:
+                return self.cache.get(text)
+            return TextCarrier(text, progress=self.progress)
+
+    def _seed_stream(self, main_key: str) -> Iterator[int]:
+        """Yield the 64-bit numbers derived from the main key's hash chain."""
+        current_seed = main_key
+        hashes = 0
         
-        if mnemonic is not None:
-            # For mnemonic, normalize but preserve spaces
-            mnemonic = self.text_processor.normalize_text(mnemonic)
-            return text, mnemonic
-        return text, None
+        try:
+            while True:
+                mapping_seed = hashlib.sha512(current_seed.encode()).digest()
+                hashes += 1
+                
+                for i in range(0, len(mapping_seed) - 8, 8):
+                    yield int.from_bytes(mapping_seed[i:i+8], 'big')
+                    
+                current_seed = hashlib.sha256(current_seed.encode()).hexdigest()
+                hashes += 1
+        finally:
+            # Reported once the caller closes the stream
+            if self.metrics is not None:
+                self.metrics.count('hash_invocations', hashes)
 
     def _generate_mapping(self, text_length: int, mnemonic_length: int, main_key: str) -> List[int]:
         """Generate a secure mapping of positions using only the main key component."""
@@ -42,51 +128,123 @@ class MnemonicEncoder:
             
         positions = []
         used_positions = set()
-        current_seed = main_key
+        progress = self.progress
+        collisions = 0
         
-        while len(positions) < mnemonic_length:
-            mapping_seed = hashlib.sha512(current_seed.encode()).digest()
+        with closing(self._seed_stream(main_key)) as numbers:
+            mapped = list(islice(numbers, mnemonic_length))
+        
+        for i, num in enumerate(mapped):
+            if progress is not None and not i % _MAP_PROGRESS_STEP:
+                progress('map', i, mnemonic_length)
+            pos = num % text_length
             
-            for i in range(0, len(mapping_seed) - 8, 8):
-                if len(positions) >= mnemonic_length:
-                    break
-                    
-                num = int.from_bytes(mapping_seed[i:i+8], 'big')
-                pos = num % text_length
-                
-                while pos in used_positions:
-                    pos = (pos + 1) % text_length
-                
-                positions.append(pos)
-                used_positions.add(pos)
-                
-            current_seed = hashlib.sha256(current_seed.encode()).hexdigest()
+            while pos in used_positions:
+                pos = (pos + 1) % text_length
+                collisions += 1
+            
+            positions.append(pos)
+            used_positions.add(pos)
         
-        logger.debug(f"Generated positions: {positions}")
-        return positions[:mnemonic_length]
+        if self.metrics is not None:
+            self.metrics.count('probe_collisions', collisions)
+        return positions
 
-    def _encode_char_offset(self, target_char: str, base_char: str = None) -> int:
-        """Calculate the offset between two characters or mark as space."""
-        if target_char.isspace():
-            return self.SPACE_MARKER
-            
-        offset = (ord(target_char) - ord(base_char)) % 255  # Use 255 instead of 256 to reserve space marker
-        logger.debug(f"Encoding: '{base_char}'({ord(base_char)}) + {offset} = '{target_char}'({ord(target_char)})")
-        return offset
+    def _shake_stream(self, main_key: str, count: int) -> Iterator[int]:
+        """Return `count` 64-bit numbers read from one bulk SHAKE-256 squeeze of the main key."""
+        stream = hashlib.shake_256(main_key.encode()).digest(8 * count)
+        if self.metrics is not None:
+            self.metrics.count('hash_invocations')
+        return (num for (num,) in struct.iter_unpack('>Q', stream))
 
-    def _decode_char_offset(self, base_char: str, offset: int) -> str:
-        """Recover the original character from base character and offset."""
-        if offset == self.SPACE_MARKER:
-            return ' '
+    def _shuffle_positions(self, text_length: int, mnemonic_length: int, numbers: Iterable[int]) -> List[int]:
+        """
+        Pick positions with a keyed partial Fisher-Yates shuffle driven by `numbers`.
+        Only swapped slots are stored, so each position costs O(1) however dense the mnemonic is.
+        """
+        if mnemonic_length > text_length:
+            raise ValueError("Mnemonic length cannot be longer than text length")
             
-        recovered = chr((ord(base_char) + offset) % 255)
-        logger.debug(f"Decoding: '{base_char}'({ord(base_char)}) + {offset} = '{recovered}'({ord(recovered)})")
-        return recovered
+        positions = []
+        swapped = {}
+        progress = self.progress
+        
+        for i, num in enumerate(islice(numbers, mnemonic_length)):
+            if progress is not None and not i % _MAP_PROGRESS_STEP:
+                progress('map', i, mnemonic_length)
+            j = i + num % (text_length - i)
+            current = swapped.pop(i, i)
+            
+            if j == i:
+                positions.append(current)
+            else:
+                positions.append(swapped.get(j, j))
+                swapped[j] = current
+        
+        return positions
 
-    def _extract_key_parts(self, key: str) -> Tuple[str, int, str, List[int]]:
-        """Extract components from the key string."""
+    def _generate_shuffled_mapping(self, text_length: int, mnemonic_length: int, main_key: str) -> List[int]:
+        """Generate positions for v2 keys: Fisher-Yates shuffle over the v1 hash chain."""
+        with closing(self._seed_stream(main_key)) as numbers:
+            return self._shuffle_positions(text_length, mnemonic_length, numbers)
+
+    def _generate_stream_mapping(self, text_length: int, mnemonic_length: int, main_key: str) -> List[int]:
+        """Generate positions for v3 keys: Fisher-Yates shuffle over a single SHAKE-256 stream."""
+        if mnemonic_length > text_length:
+            raise ValueError("Mnemonic length cannot be longer than text length")
+        numbers = self._shake_stream(main_key, mnemonic_length)
+        return self._shuffle_positions(text_length, mnemonic_length, numbers)
+
+    def _positions_for(self, version: str, text_length: int, mnemonic_length: int, main_key: str) -> List[int]:
+        """Generate positions with the mapping scheme of the given key version."""
+        if version not in self.KEY_VERSIONS:
+            raise ValueError("Unsupported encoding version")
+        generate = getattr(self, self.KEY_VERSIONS[version])
+        with self.stage('mapping', mnemonic_length):
+            positions = generate(text_length, mnemonic_length, main_key)
+        if self.progress is not None:
+            self.progress('map', mnemonic_length, mnemonic_length)
+        
+        if self.trace is not None:
+            self.trace(f"Generated {version} positions: {positions}")
+        return positions
+
+    def _split_tag(self, version: str, offsets: bytes) -> Tuple[bytes, bytes]:
+        """Separate the carrier tag of a tagged key version from its offsets."""
+        if version not in self.TAGGED_KEY_VERSIONS:
+            return offsets, b''
+        if len(offsets) < self.TAG_SIZE:
+            raise ValueError("Invalid key: missing carrier tag")
+        return offsets[:-self.TAG_SIZE], offsets[-self.TAG_SIZE:]
+
+    def _carrier_tag(self, main_key: str, content_length: int, samples: bytes) -> bytes:
+        """
+        Tag a carrier by its content length and the characters at the sample
+        positions. The secret is left out on purpose: the main key travels in
+        the key, so a tag over the secret would let anyone holding the key test
+        guesses of it without the carrier.
+        """
+        import hmac
+        message = struct.pack('>Q', content_length) + samples
+        return hmac.new(main_key.encode(), message, hashlib.sha256).digest()[:self.TAG_SIZE]
+
+    def _key_positions(self, version: str, text_length: int, content_length: int, main_key: str) -> List[int]:
+        """
+        Positions a key maps onto the carrier: the secret's, followed by the tag
+        samples of tagged versions. Shuffled positions never repeat, so the
+        samples never overlap the secret.
+        """
+        samples = 0
+        if version in self.TAGGED_KEY_VERSIONS:
+            samples = max(0, min(self.TAG_SAMPLES, text_length - content_length))
+        return self._positions_for(version, text_length, content_length + samples, main_key)
+
+    def _extract_key_parts(self, key: str) -> Tuple[str, int, str, bytes]:
+        """Extract components from a text or binary key string."""
         try:
-            logger.debug(f"Extracting key parts from: {key[:50]}...")
+            prefix, _, rest = key.partition('-')
+            if prefix.endswith('b') and rest:
+                return self._extract_binary_key_parts(prefix[:-1], rest)
             
             parts = key.split('-')
             if len(parts) < 3:
@@ -95,117 +253,291 @@ class MnemonicEncoder:
             version = parts[0]
             length = int(parts[1], 16)
             main_key = parts[2]
-            offsets = []
+            offsets = b''
             
             if len(parts) > 3:
                 offsets_hex = parts[3]
-                offsets = [int(offsets_hex[i:i+2], 16) for i in range(0, len(offsets_hex), 2)]
-                logger.debug(f"Parsed {len(offsets)} offsets")
+                if len(offsets_hex) % 2 == 0:
+                    offsets = bytes.fromhex(offsets_hex)
+                else:
+                    # Odd-length offsets: the last offset is a single hex digit
+                    offsets = bytes(int(offsets_hex[i:i+2], 16) for i in range(0, len(offsets_hex), 2))
                 
             return version, length, main_key, offsets
             
         except Exception as e:
-            logger.error(f"Failed to parse key: {str(e)}")
+            _logger().error(f"Failed to parse key: {str(e)}")
             raise ValueError(f"Failed to parse key: {str(e)}")
 
-    def encode(self, mnemonic: str, text: str) -> Tuple[str, str]:
-        """Encode a mnemonic phrase within the provided text."""
-        logger.debug("Starting encoding process")
-        
-        # Normalize inputs (preserves spaces in mnemonic)
-        text, mnemonic = self._normalize_inputs(text, mnemonic)
+    def _extract_binary_key_parts(self, version: str, encoded: str) -> Tuple[str, int, str, bytes]:
+        """Unpack the payload of a binary key."""
+        import base64
+        payload = base64.b64decode(encoded + '=' * (-len(encoded) % 4), altchars=b'-_', validate=True)
+        if len(payload) < self.BINARY_KEY_HEADER.size:
+            raise ValueError("Invalid key format")
+        length, main_key = self.BINARY_KEY_HEADER.unpack_from(payload)
+        return version, length, main_key.hex(), payload[self.BINARY_KEY_HEADER.size:]
+
+    def _format_key(self, version: str, length: int, main_key: str, offsets: Sequence[int],
+                    key_format: str) -> str:
+        """Serialize key components as a text or binary key."""
+        offsets = bytes(offsets)
+        if key_format == "text":
+            return f"{version}-{length:04x}-{main_key}-{offsets.hex()}"
         
-        if not mnemonic or not text:
+        import base64
+        main_key_bytes = bytes.fromhex(main_key)
+        if len(main_key_bytes) != 32 or main_key_bytes.hex() != main_key:
+            raise ValueError("Only keys with a 64-digit lowercase hex main key can be made binary")
+        payload = self.BINARY_KEY_HEADER.pack(length, main_key_bytes) + offsets
+        encoded = base64.urlsafe_b64encode(payload).rstrip(b'=').decode('ascii')
+        return f"{version}b-{encoded}"
+
+    def convert_key(self, key: str, key_format: str) -> str:
+        """Convert a key between the text and binary formats without changing what it decodes to."""
+        if key_format not in self.KEY_FORMATS:
+            raise ValueError(f"Unsupported key format: {key_format}")
+        version, length, main_key, offsets = self._extract_key_parts(key)
+        if version not in self.KEY_VERSIONS:
+            raise ValueError("Unsupported encoding version")
+        return self._format_key(version, length, main_key, offsets, key_format)
+
+    def _check_encode_inputs(self, mnemonic: str, carrier: Carrier) -> None:
+        """Ensure the normalized mnemonic fits into the carrier."""
+        if not mnemonic or not len(carrier):
             raise ValueError("Mnemonic and text must not be empty")
             
         # Count non-whitespace characters in mnemonic for length check
         mnemonic_content_length = len([c for c in mnemonic if not c.isspace()])
-        if len(text) < mnemonic_content_length:
+        if len(carrier) < mnemonic_content_length:
             raise ValueError("Text must be at least as long as non-whitespace characters in mnemonic")
-            
-        if not self.text_processor.validate_text_source(text):
-            logger.warning("Text might not be suitable for secure encoding")
+
+    @staticmethod
+    def _cut_like(words: List[bytes], content: bytes) -> List[bytes]:
+        """Cut content into consecutive pieces as long as the given words."""
+        pieces = []
+        start = 0
+        for word in words:
+            pieces.append(content[start:start + len(word)])
+            start += len(word)
+        return pieces
+
+    def _offsets_for(self, mnemonic_bytes: bytes, base_bytes: bytes) -> bytes:
+        """Key offsets of a normalized mnemonic against the base characters at its positions."""
+        content_bytes = mnemonic_bytes.translate(None, _MNEMONIC_WHITESPACE)
+        # Offsets wrap at 255, not 256, so they never collide with the space marker
+        content_offsets = bytes((target - base) % 255 for target, base in zip(content_bytes, base_bytes))
         
+        # Whitespace is keyed as a space marker in place of an offset
+        marker = bytes([self.SPACE_MARKER])
+        words = mnemonic_bytes.translate(bytes.maketrans(_MNEMONIC_WHITESPACE, marker * len(_MNEMONIC_WHITESPACE)))
+        return marker.join(self._cut_like(words.split(marker), content_offsets))
+
+    def _apply_offsets(self, offsets: bytes, base_bytes: bytes) -> str:
+        """Recover a mnemonic from key offsets and the base characters at its positions."""
+        marker = bytes([self.SPACE_MARKER])
+        content_offsets = offsets.replace(marker, b'')
+        # Recovered character codes stay below 255, so Latin-1 maps them back to chr()
+        recovered = bytes((base + offset) % 255 for base, offset in zip(base_bytes, content_offsets))
+        
+        # Each space marker decodes to a single space
+        return b' '.join(self._cut_like(offsets.split(marker), recovered)).decode('latin-1')
+
+    def _build_key(self, mnemonic: str, carrier: Carrier) -> str:
+        """Map a normalized mnemonic onto the carrier content and return the key."""
+        # Imported here: only encoding needs it, and it pulls in random and base64
+        import secrets
         main_key = secrets.token_hex(32)
-        version = "v1"
-        length_hex = f"{len(mnemonic):04x}"
+        version = self.key_version
         
-        # Count non-space characters for position mapping
-        mnemonic_chars = list(mnemonic)
-        content_chars = [c for c in mnemonic_chars if not c.isspace()]
+        # Offsets are computed over byte strings: the normalized mnemonic and the
+        # carrier content are both ASCII
+        mnemonic_bytes = mnemonic.encode('ascii')
+        content_bytes = mnemonic_bytes.translate(None, _MNEMONIC_WHITESPACE)
         
-        positions = self._generate_mapping(len(text), len(content_chars), main_key)
+        positions = self._key_positions(version, len(carrier), len(content_bytes), main_key)
         
-        text_chars = list(text)
-        offsets = []
+        with self.stage('offsets', len(mnemonic_bytes)):
+            chars = ''.join(carrier.chars_at(positions)).encode('ascii')
+            base_bytes = chars[:len(content_bytes)]
+            offsets = self._offsets_for(mnemonic_bytes, base_bytes)
+            if version in self.TAGGED_KEY_VERSIONS:
+                offsets += self._carrier_tag(main_key, len(carrier), chars[len(content_bytes):])
         
-        logger.debug("Calculating character offsets:")
-        pos_idx = 0
-        for target_char in mnemonic_chars:
-            if target_char.isspace():
-                offsets.append(self.SPACE_MARKER)
-            else:
-                base_char = text_chars[positions[pos_idx]]
-                offset = self._encode_char_offset(target_char, base_char)
-                offsets.append(offset)
-                pos_idx += 1
-                logger.debug(f"Position {pos_idx-1}: {positions[pos_idx-1]} -> base='{base_char}' + {offset} = '{target_char}'")
+        trace = self.trace
+        if trace is not None:
+            content_offsets = offsets.replace(bytes([self.SPACE_MARKER]), b'')
+            for pos_idx, (target, base, offset) in enumerate(zip(content_bytes, base_bytes, content_offsets)):
+                trace(f"Position {pos_idx}: {positions[pos_idx]} -> base='{chr(base)}' + {offset} = '{chr(target)}'")
         
-        offsets_hex = ''.join(f"{offset:02x}" for offset in offsets)
-        key = f"{version}-{length_hex}-{main_key}-{offsets_hex}"
+        return self._format_key(version, len(mnemonic), main_key, offsets, self.key_format)
+
+    def encode_key(self, mnemonic: str, text: Union[str, Carrier]) -> str:
+        """
+        Encode a mnemonic phrase within the provided text and return only the key.
+        With a MappedCarrier this never materializes the stripped text.
+        """
+        if self.trace is not None:
+            self.trace("Starting encoding process")
+        
+        # Strip the carrier to its content; the mnemonic keeps its spaces
+        carrier = self._as_carrier(text)
+        with self.stage('normalize', len(mnemonic or '')):
+            mnemonic = self.text_processor.normalize_text(mnemonic)
+        self._check_encode_inputs(mnemonic, carrier)
+        
+        with self.stage('validate', len(carrier)):
+            suitable = carrier.is_suitable()
+        if not suitable:
+            _logger().warning("Text might not be suitable for secure encoding")
+        
+        return self._build_key(mnemonic, carrier)
+
+    def encode(self, mnemonic: str, text: Union[str, Carrier]) -> Tuple[str, str]:
+        """Encode a mnemonic phrase within the provided text."""
+        carrier = self._as_carrier(text)
+        key = self.encode_key(mnemonic, carrier)
         
         # Format output for display
-        formatted_output = self.text_processor.format_output(text)
+        formatted_output = self._format_carrier(carrier)
         return formatted_output, key
 
-    def decode(self, encoded_text: str, key: str) -> str:
-        """Decode a mnemonic phrase using character offsets."""
-        logger.debug("Starting decoding process")
+    def _format_carrier(self, carrier: Carrier) -> str:
+        """Format the carrier content for display."""
+        with self.stage('format', len(carrier)):
+            return ''.join(self.text_processor.iter_format_output(carrier.iter_content()))
+
+    def encode_many(self, jobs: Iterable[Tuple[str, Union[str, Carrier]]]) -> List[Tuple[str, str]]:
+        """
+        Encode several (mnemonic, text) jobs, preparing each distinct text only once.
+        Results are returned in job order and match what encode() would return.
+        """
+        if self.trace is not None:
+            self.trace("Starting batch encoding process")
         
-        # Normalize and strip whitespace for position mapping
-        encoded_text, _ = self._normalize_inputs(encoded_text)
+        # text -> (carrier, suitable for encoding, formatted output)
+        carriers = {}
+        results = []
         
-        if not encoded_text or not key:
+        for mnemonic, text in jobs:
+            prepared = carriers.get(text)
+            if prepared is None:
+                carrier = self._as_carrier(text)
+                with self.stage('validate', len(carrier)):
+                    suitable = carrier.is_suitable()
+                prepared = (carrier, suitable, self._format_carrier(carrier))
+                carriers[text] = prepared
+            carrier, suitable, formatted_output = prepared
+            
+            with self.stage('normalize', len(mnemonic or '')):
+                mnemonic = self.text_processor.normalize_text(mnemonic)
+            self._check_encode_inputs(mnemonic, carrier)
+            
+            if not suitable:
+                _logger().warning("Text might not be suitable for secure encoding")
+            
+            results.append((formatted_output, self._build_key(mnemonic, carrier)))
+        
+        return results
+
+    def _recover(self, carrier: Carrier, key: str) -> str:
+        """Recover a mnemonic from a prepared encoded text using the key."""
+        if not len(carrier) or not key:
             raise ValueError("Encoded text and key must not be empty")
         
         try:
-            version, length, main_key, offsets = self._extract_key_parts(key)
-            
-            if version != "v1":
-                raise ValueError("Unsupported encoding version")
+            with self.stage('parse_key', len(key)):
+                version, length, main_key, offsets = self._extract_key_parts(key)
+                offsets, tag = self._split_tag(version, offsets)
             
             # Count non-space characters for position mapping
-            content_count = sum(1 for x in offsets if x != self.SPACE_MARKER)
-            positions = self._generate_mapping(len(encoded_text), content_count, main_key)
+            content_offsets = offsets.replace(bytes([self.SPACE_MARKER]), b'')
+            positions = self._key_positions(version, len(carrier), len(content_offsets), main_key)
             
-            if any(pos >= len(encoded_text) for pos in positions):
+            if any(pos >= len(carrier) for pos in positions):
                 raise ValueError("Invalid key: positions exceed text length")
             
-            logger.debug("Recovering characters:")
-            result = []
-            pos_idx = 0
+            with self.stage('offsets', len(offsets)):
+                chars = ''.join(carrier.chars_at(positions)).encode('ascii')
+                base_bytes = chars[:len(content_offsets)]
+                # A tagged key rejects a wrong carrier instead of decoding garbage
+                if tag and not self._tag_matches(tag, main_key, len(carrier), chars[len(content_offsets):]):
+                    raise ValueError("Key does not match this carrier")
+                decoded = self._apply_offsets(offsets, base_bytes)
             
-            for offset in offsets:
-                if offset == self.SPACE_MARKER:
-                    result.append(' ')
-                else:
-                    base_char = encoded_text[positions[pos_idx]]
-                    recovered_char = self._decode_char_offset(base_char, offset)
-                    logger.debug(f"Position {pos_idx}: {positions[pos_idx]} -> base='{base_char}' + {offset} = '{recovered_char}'")
-                    result.append(recovered_char)
-                    pos_idx += 1
+            trace = self.trace
+            if trace is not None:
+                for pos_idx, (base, offset) in enumerate(zip(base_bytes, content_offsets)):
+                    trace(f"Position {pos_idx}: {positions[pos_idx]} -> base='{chr(base)}' + {offset} = '{chr((base + offset) % 255)}'")
             
-            decoded = ''.join(result)
-            logger.debug(f"Decoded result: {repr(decoded)}")
+            if trace is not None:
+                trace(f"Decoded result: {repr(decoded)}")
             
             return decoded
             
         except Exception as e:
-            logger.error(f"Decoding failed: {str(e)}")
+            _logger().error(f"Decoding failed: {str(e)}")
             raise ValueError(f"Failed to decode: {str(e)}")
 
-    def validate_text_source(self, text: str) -> bool:
+    def _tag_matches(self, tag: bytes, main_key: str, content_length: int, samples: bytes) -> bool:
+        import hmac
+        return hmac.compare_digest(tag, self._carrier_tag(main_key, content_length, samples))
+
+    def matches(self, text: Union[str, Carrier], key: str) -> bool:
+        """
+        Check whether a tagged (v4) key was made with this carrier, without
+        decoding: the position mapping plus TAG_SAMPLES character lookups.
+        """
+        version, _, main_key, offsets = self._extract_key_parts(key)
+        offsets, tag = self._split_tag(version, offsets)
+        if not tag:
+            raise ValueError(f"{version} keys carry no carrier tag")
+        
+        carrier = self._as_carrier(text)
+        content_length = len(offsets) - offsets.count(self.SPACE_MARKER)
+        if len(carrier) < content_length:
+            return False
+        positions = self._key_positions(version, len(carrier), content_length, main_key)
+        samples = ''.join(carrier.chars_at(positions[content_length:])).encode('ascii')
+        return self._tag_matches(tag, main_key, len(carrier), samples)
+
+    def decode(self, encoded_text: Union[str, Carrier], key: str) -> str:
+        """Decode a mnemonic phrase using character offsets."""
+        if self.trace is not None:
+            self.trace("Starting decoding process")
+        
+        # Normalize and strip whitespace for position mapping
+        return self._recover(self._as_carrier(encoded_text), key)
+
+    def decode_file(self, file_path: Union[str, 'Path'], key: str) -> str:
+        """
+        Decode a mnemonic from an encoded text file without loading it into memory.
+        One counting scan sizes the content, then only the file blocks holding
+        mapped positions are read back.
+        """
+        with MappedCarrier(file_path) as carrier:
+            return self.decode(carrier, key)
+
+    def decode_many(self, jobs: Iterable[Tuple[Union[str, Carrier], str]]) -> List[str]:
+        """
+        Decode several (encoded_text, key) jobs, preparing each distinct text only once.
+        Results are returned in job order and match what decode() would return.
+        """
+        if self.trace is not None:
+            self.trace("Starting batch decoding process")
+        
+        carriers = {}
+        results = []
+        
+        for encoded_text, key in jobs:
+            carrier = carriers.get(encoded_text)
+            if carrier is None:
+                carrier = self._as_carrier(encoded_text)
+                carriers[encoded_text] = carrier
+            results.append(self._recover(carrier, key))
+        
+        return results
+
+    def validate_text_source(self, text: Union[str, Carrier]) -> bool:
         """Validate if the provided text is suitable as a source for encoding."""
-        # First normalize the text
-        text, _ = self._normalize_inputs(text)
-        return self.text_processor.validate_text_source(text)
\ No newline at end of file
+        return self._as_carrier(text).is_suitable()
\ No newline at end of file
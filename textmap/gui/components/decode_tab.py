@@ -1,18 +1,24 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from ..utils import browse_file, create_scrolled_text
+from ..utils import browse_file, create_scrolled_text, is_large_file
+from ..worker import BackgroundTask
+from .file_preview import FilePreview
+from .progress_frame import ProgressFrame
+from ...carrier import MappedCarrier, TextCarrier
 from ...encoder import MnemonicEncoder
 from ...text_processor import TextProcessor
 
 class DecodeTab:
     def __init__(self, parent):
-        self.encoder = MnemonicEncoder()
         self.processor = TextProcessor()
+        # Carrier of a file opened in large file mode
+        self.file_carrier = None
         
         self.frame = ttk.Frame(parent, padding="5")
         self.frame.columnconfigure(1, weight=1)
         
         self.setup_ui()
+        self.task = BackgroundTask(self.frame, self.progress.update)
         
     def setup_ui(self):
         # Encoded Text Input Options
@@ -27,8 +33,9 @@ class DecodeTab:
         encoded_entry = ttk.Entry(file_frame, textvariable=self.encoded_file_var)
         encoded_entry.grid(row=0, column=0, padx=5, sticky=(tk.W, tk.E))
         
-        ttk.Button(file_frame, text="Browse", 
-                  command=self.browse_encoded_file).grid(row=0, column=1, padx=2)
+        self.browse_button = ttk.Button(file_frame, text="Browse", 
+                                        command=self.browse_encoded_file)
+        self.browse_button.grid(row=0, column=1, padx=2)
         ttk.Button(file_frame, text="Clear", 
                   command=self.clear_encoded).grid(row=0, column=2)
         
@@ -37,6 +44,11 @@ class DecodeTab:
         encoded_frame, self.encoded_text = create_scrolled_text(self.frame, height=10)
         encoded_frame.grid(row=2, column=0, columnspan=3, pady=5, sticky=(tk.W, tk.E))
         
+        # Large files get a paged preview instead of the full text
+        self.preview = FilePreview(self.frame, self.encoded_text)
+        self.preview.frame.grid(row=1, column=1, columnspan=2, sticky=tk.E)
+        self.preview.frame.grid_remove()
+        
         # Bind text changes to clear file path
         self.encoded_text.bind('<<Modified>>', self.on_text_modified)
         
@@ -49,10 +61,13 @@ class DecodeTab:
         button_frame = ttk.Frame(self.frame)
         button_frame.grid(row=5, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=5)
         
-        ttk.Button(button_frame, text="Decode", 
-                  command=self.decode).pack(side=tk.LEFT, padx=5)
+        self.decode_button = ttk.Button(button_frame, text="Decode", 
+                                        command=self.decode)
+        self.decode_button.pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Clear All", 
                   command=self.clear_all).pack(side=tk.LEFT, padx=5)
+        self.progress = ProgressFrame(button_frame, on_cancel=self.cancel)
+        self.progress.frame.pack(side=tk.LEFT, padx=5)
         self.status_label = ttk.Label(button_frame, text="")
         self.status_label.pack(side=tk.LEFT, padx=5)
 
@@ -66,24 +81,98 @@ class DecodeTab:
     
     def browse_encoded_file(self):
         """Handle file browsing and loading"""
+        if self.task.running:
+            return
         filename = browse_file(self.encoded_file_var)
-        if filename:
-            try:
-                text = self.processor.prepare_text_for_encoding(filename)
+        if filename and is_large_file(filename):
+            self.browse_large_file(filename)
+        elif filename:
+            def load(report):
+                report('load', 0, 1)
+                return self.processor.prepare_text_for_encoding(filename)
+            
+            def loaded(text):
+                self.finish_task()
+                self.release_file()
                 self.encoded_text.delete(1.0, tk.END)
                 self.encoded_text.insert(1.0, text)
-            except Exception as e:
-                messagebox.showerror("Error", f"Error loading file: {str(e)}")
+            
+            def failed(error):
+                self.finish_task()
+                messagebox.showerror("Error", f"Error loading file: {str(error)}")
                 self.encoded_file_var.set("")
+            
+            self.start_task(load, loaded, failed)
+    
+    def browse_large_file(self, filename):
+        """Open a large file from disk, showing only a preview of it"""
+        def load(report):
+            carrier = MappedCarrier(filename, progress=report)
+            try:
+                if not carrier.is_suitable():
+                    raise ValueError(TextProcessor.UNSUITABLE_TEXT_MESSAGE)
+            except BaseException:
+                carrier.close()
+                raise
+            return carrier
+        
+        def loaded(carrier):
+            self.finish_task()
+            self.release_file()
+            self.file_carrier = carrier
+            self.preview.show(filename)
+        
+        def failed(error):
+            self.finish_task()
+            self.release_file()
+            messagebox.showerror("Error", f"Error loading file: {str(error)}")
+            self.encoded_file_var.set("")
+        
+        self.start_task(load, loaded, failed)
+    
+    def release_file(self):
+        """Leave large file mode, closing the file"""
+        if self.file_carrier is not None:
+            self.file_carrier.close()
+            self.file_carrier = None
+        if self.preview.active:
+            self.preview.clear()
+    
+    def start_task(self, func, on_success, on_error):
+        """Run an operation in the background while the buttons are disabled"""
+        self.decode_button.config(state='disabled')
+        self.browse_button.config(state='disabled')
+        self.status_label.config(text="")
+        self.progress.start()
+        self.task.start(func, on_success, on_error, on_cancel=self.cancelled)
+    
+    def finish_task(self):
+        """Restore the buttons after a background operation"""
+        self.progress.reset()
+        self.decode_button.config(state='normal')
+        self.browse_button.config(state='normal')
+    
+    def cancel(self):
+        """Cancel the running background operation"""
+        self.task.cancel()
+    
+    def cancelled(self):
+        self.finish_task()
+        self.status_label.config(text="Cancelled", foreground="red")
     
     def on_text_modified(self, event=None):
         """Clear file path if text is modified directly"""
         if self.encoded_text.edit_modified():
-            self.encoded_file_var.set("")
+            # Preview pages belong to the open file
+            if not self.preview.active:
+                self.encoded_file_var.set("")
             self.encoded_text.edit_modified(False)
     
     def clear_encoded(self):
         """Clear encoded text and file path"""
+        if self.task.running:
+            return
+        self.release_file()
         self.encoded_file_var.set("")
         self.encoded_text.delete(1.0, tk.END)
     
@@ -104,22 +193,40 @@ class DecodeTab:
         return text
     
     def decode(self):
+        if self.task.running:
+            return
         try:
-            encoded_text = self.get_encoded_text()
+            # In large file mode the carrier comes from the file, not the widget
+            file_carrier = self.file_carrier
+            encoded_text = self.get_encoded_text() if file_carrier is None else None
             key = self.key_text.get(1.0, tk.END).strip()
             
             if not key:
                 raise ValueError('Please provide the decoding key')
-                
-            decoded = self.encoder.decode(encoded_text, key)
+        except Exception as e:
+            self.status_label.config(text=f"Error: {str(e)}", foreground="red")
+            return
+        
+        def decode(report):
+            if file_carrier is not None:
+                carrier = file_carrier
+            else:
+                carrier = TextCarrier(encoded_text, progress=report)
+            return MnemonicEncoder(progress=report).decode(carrier, key)
+        
+        def decoded(result):
+            self.finish_task()
             
             # Update decoded output
             self.decoded_text.config(state='normal')
             self.decoded_text.delete(1.0, tk.END)
-            self.decoded_text.insert(1.0, decoded)
+            self.decoded_text.insert(1.0, result)
             self.decoded_text.config(state='disabled')
             
             self.status_label.config(text="Decoding successful", foreground="green")
-            
-        except Exception as e:
-            self.status_label.config(text=f"Error: {str(e)}", foreground="red")
\ No newline at end of file
+        
+        def failed(error):
+            self.finish_task()
+            self.status_label.config(text=f"Error: {str(error)}", foreground="red")
+        
+        self.start_task(decode, decoded, failed)
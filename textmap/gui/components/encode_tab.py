@@ -1,18 +1,24 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from ..utils import browse_file, create_scrolled_text, copy_to_clipboard, save_to_file
+from ..utils import browse_file, create_scrolled_text, is_large_file, copy_to_clipboard, save_to_file
+from ..worker import BackgroundTask
+from .file_preview import FilePreview
+from .progress_frame import ProgressFrame
+from ...carrier import MappedCarrier, TextCarrier
 from ...encoder import MnemonicEncoder
 from ...text_processor import TextProcessor
 
 class EncodeTab:
     def __init__(self, parent):
-        self.encoder = MnemonicEncoder()
         self.processor = TextProcessor()
+        # Carrier of a file opened in large file mode
+        self.file_carrier = None
         
         self.frame = ttk.Frame(parent, padding="5")
         self.frame.columnconfigure(1, weight=1)
         
         self.setup_ui()
+        self.task = BackgroundTask(self.frame, self.progress.update)
         
     def setup_ui(self):
         # Source Text Input Options
@@ -27,8 +33,9 @@ class EncodeTab:
         source_entry = ttk.Entry(file_frame, textvariable=self.source_file_var)
         source_entry.grid(row=0, column=0, padx=5, sticky=(tk.W, tk.E))
         
-        ttk.Button(file_frame, text="Browse", 
-                  command=self.browse_source_file).grid(row=0, column=1, padx=2)
+        self.browse_button = ttk.Button(file_frame, text="Browse", 
+                                        command=self.browse_source_file)
+        self.browse_button.grid(row=0, column=1, padx=2)
         ttk.Button(file_frame, text="Clear", 
                   command=self.clear_source).grid(row=0, column=2)
         
@@ -37,6 +44,11 @@ class EncodeTab:
         source_frame, self.source_text = create_scrolled_text(self.frame, height=10)
         source_frame.grid(row=2, column=0, columnspan=3, pady=5, sticky=(tk.W, tk.E))
         
+        # Large files get a paged preview instead of the full text
+        self.preview = FilePreview(self.frame, self.source_text)
+        self.preview.frame.grid(row=1, column=1, columnspan=2, sticky=tk.E)
+        self.preview.frame.grid_remove()
+        
         # Bind text changes to clear file path
         self.source_text.bind('<<Modified>>', self.on_text_modified)
         
@@ -49,10 +61,13 @@ class EncodeTab:
         button_frame = ttk.Frame(self.frame)
         button_frame.grid(row=5, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=5)
         
-        ttk.Button(button_frame, text="Encode", 
-                  command=self.encode).pack(side=tk.LEFT, padx=5)
+        self.encode_button = ttk.Button(button_frame, text="Encode", 
+                                        command=self.encode)
+        self.encode_button.pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Clear All", 
                   command=self.clear_all).pack(side=tk.LEFT, padx=5)
+        self.progress = ProgressFrame(button_frame, on_cancel=self.cancel)
+        self.progress.frame.pack(side=tk.LEFT, padx=5)
         self.status_label = ttk.Label(button_frame, text="")
         self.status_label.pack(side=tk.LEFT, padx=5)
 
@@ -75,24 +90,98 @@ class EncodeTab:
 
     def browse_source_file(self):
         """Handle file browsing and loading"""
+        if self.task.running:
+            return
         filename = browse_file(self.source_file_var)
-        if filename:
-            try:
-                text = self.processor.prepare_text_for_encoding(filename)
+        if filename and is_large_file(filename):
+            self.browse_large_file(filename)
+        elif filename:
+            def load(report):
+                report('load', 0, 1)
+                return self.processor.prepare_text_for_encoding(filename)
+            
+            def loaded(text):
+                self.finish_task()
+                self.release_file()
                 self.source_text.delete(1.0, tk.END)
                 self.source_text.insert(1.0, text)
-            except Exception as e:
-                messagebox.showerror("Error", f"Error loading file: {str(e)}")
+            
+            def failed(error):
+                self.finish_task()
+                messagebox.showerror("Error", f"Error loading file: {str(error)}")
                 self.source_file_var.set("")
+            
+            self.start_task(load, loaded, failed)
+    
+    def browse_large_file(self, filename):
+        """Open a large file from disk, showing only a preview of it"""
+        def load(report):
+            carrier = MappedCarrier(filename, progress=report)
+            try:
+                if not carrier.is_suitable():
+                    raise ValueError(TextProcessor.UNSUITABLE_TEXT_MESSAGE)
+            except BaseException:
+                carrier.close()
+                raise
+            return carrier
+        
+        def loaded(carrier):
+            self.finish_task()
+            self.release_file()
+            self.file_carrier = carrier
+            self.preview.show(filename)
+        
+        def failed(error):
+            self.finish_task()
+            self.release_file()
+            messagebox.showerror("Error", f"Error loading file: {str(error)}")
+            self.source_file_var.set("")
+        
+        self.start_task(load, loaded, failed)
+    
+    def release_file(self):
+        """Leave large file mode, closing the file"""
+        if self.file_carrier is not None:
+            self.file_carrier.close()
+            self.file_carrier = None
+        if self.preview.active:
+            self.preview.clear()
+    
+    def start_task(self, func, on_success, on_error):
+        """Run an operation in the background while the buttons are disabled"""
+        self.encode_button.config(state='disabled')
+        self.browse_button.config(state='disabled')
+        self.status_label.config(text="")
+        self.progress.start()
+        self.task.start(func, on_success, on_error, on_cancel=self.cancelled)
+    
+    def finish_task(self):
+        """Restore the buttons after a background operation"""
+        self.progress.reset()
+        self.encode_button.config(state='normal')
+        self.browse_button.config(state='normal')
+    
+    def cancel(self):
+        """Cancel the running background operation"""
+        self.task.cancel()
+    
+    def cancelled(self):
+        self.finish_task()
+        self.status_label.config(text="Cancelled", foreground="red")
     
     def on_text_modified(self, event=None):
         """Clear file path if text is modified directly"""
         if self.source_text.edit_modified():
-            self.source_file_var.set("")
+            # Preview pages belong to the open file
+            if not self.preview.active:
+                self.source_file_var.set("")
             self.source_text.edit_modified(False)
     
     def clear_source(self):
         """Clear source text and file path"""
+        if self.task.running:
+            return
+        self.release_file()
         self.source_file_var.set("")
         self.source_text.delete(1.0, tk.END)
     
@@ -104,11 +193,11 @@ class EncodeTab:
         self.status_label.config(text="")
     
     def get_source_text(self):
-        """Get text from text widget"""
+        """Get text from text widget; it is normalized when the carrier is prepared"""
         text = self.source_text.get(1.0, tk.END).strip()
         if not text:
             raise ValueError("Please provide source text")
-        return self.processor.normalize_text(text)
+        return text
     
     def copy_key(self):
         """Copy key to clipboard"""
@@ -123,24 +212,49 @@ class EncodeTab:
             save_to_file(key)
     
     def encode(self):
+        if self.task.running:
+            return
         try:
-            text = self.get_source_text()
+            # In large file mode the carrier comes from the file, not the widget
+            file_carrier = self.file_carrier
+            text = self.get_source_text() if file_carrier is None else None
             secret = self.secret_text.get(1.0, tk.END).strip()
             
             if not secret:
                 raise ValueError('Please provide secret information to encode')
-                
-            if not self.processor.validate_text_source(text):
+        except Exception as e:
+            self.status_label.config(text=f"Error: {str(e)}", foreground="red")
+            return
+        
+        # Prepare the carrier once for both validation and encoding
+        def prepare(report):
+            if file_carrier is not None:
+                carrier = file_carrier
+            else:
+                carrier = TextCarrier(text, progress=report)
+            return carrier, carrier.is_suitable()
+        
+        def prepared(result):
+            carrier, suitable = result
+            if not suitable:
+                self.finish_task()
                 if not messagebox.askyesno("Warning", 
                     "The source text might not be suitable for secure encoding. Continue anyway?"):
                     return
-                    
-            _, key = self.encoder.encode(secret, text)
+            
+            self.start_task(lambda report: MnemonicEncoder(progress=report).encode_key(secret, carrier),
+                            encoded, failed)
+        
+        def encoded(key):
+            self.finish_task()
             
             # Update key display
             self.key_var.set(key)
             
             self.status_label.config(text="Encoding successful", foreground="green")
-            
-        except Exception as e:
-            self.status_label.config(text=f"Error: {str(e)}", foreground="red")
\ No newline at end of file
+        
+        def failed(error):
+            self.finish_task()
+            self.status_label.config(text=f"Error: {str(error)}", foreground="red")
+        
+        self.start_task(prepare, prepared, failed)
@@ -0,0 +1,72 @@
+import os
+import tkinter as tk
+from tkinter import ttk
+from typing import Optional
+from ...text_processor import TextProcessor
+
+class FilePreview:
+    """
+    Paged, read-only view of a large file in a Text widget. Only one page is
+    read from disk at a time, so the file is never held in the widget.
+    """
+    
+    # Bytes read from the file per page
+    PAGE_SIZE = 64 * 1024
+    
+    def __init__(self, parent, text_widget: tk.Text):
+        self.text_widget = text_widget
+        self.file_path: Optional[str] = None
+        self.page = 0
+        self.pages = 0
+        
+        self.frame = ttk.Frame(parent)
+        self.setup_ui()
+        
+    def setup_ui(self):
+        self.prev_button = ttk.Button(self.frame, text="< Prev", 
+                                      command=lambda: self.show_page(self.page - 1))
+        self.prev_button.pack(side=tk.LEFT, padx=2)
+        self.page_label = ttk.Label(self.frame, text="")
+        self.page_label.pack(side=tk.LEFT, padx=5)
+        self.next_button = ttk.Button(self.frame, text="Next >", 
+                                      command=lambda: self.show_page(self.page + 1))
+        self.next_button.pack(side=tk.LEFT, padx=2)
+    
+    @property
+    def active(self) -> bool:
+        return self.file_path is not None
+    
+    def show(self, file_path: str) -> None:
+        """Switch the widget to a read-only preview of file_path"""
+        self.file_path = file_path
+        self.pages = max(1, -(-os.path.getsize(file_path) // self.PAGE_SIZE))
+        self.frame.grid()
+        self.show_page(0)
+    
+    def clear(self) -> None:
+        """Leave preview mode and hand the widget back for editing"""
+        self.file_path = None
+        self.frame.grid_remove()
+        self.text_widget.config(state='normal')
+        self.text_widget.delete(1.0, tk.END)
+    
+    def show_page(self, page: int) -> None:
+        """Display one page of the file, normalized as it will be encoded"""
+        if not self.active or not 0 <= page < self.pages:
+            return
+        self.page = page
+        
+        with open(self.file_path, 'rb') as f:
+            f.seek(page * self.PAGE_SIZE)
+            data = f.read(self.PAGE_SIZE)
+        # Characters split at the page edges are dropped from the preview only
+        text = TextProcessor.normalize_text(data.decode('utf-8', errors='ignore'))
+        
+        self.text_widget.config(state='normal')
+        self.text_widget.delete(1.0, tk.END)
+        self.text_widget.insert(1.0, text)
+        self.text_widget.config(state='disabled')
+        
+        self.page_label.config(text=f"Large file: page {page + 1} of {self.pages}")
+        self.prev_button.config(state='normal' if page > 0 else 'disabled')
+        self.next_button.config(state='normal' if page < self.pages - 1 else 'disabled')
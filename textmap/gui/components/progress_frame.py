@@ -0,0 +1,45 @@
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable
+
+# Status text for the progress stages reported by the encoder and carriers
+STAGE_LABELS = {
+    'load': "Loading file",
+    'index': "Indexing file",
+    'normalize': "Normalizing text",
+    'validate': "Validating text",
+    'map': "Mapping positions",
+}
+
+class ProgressFrame:
+    def __init__(self, parent, on_cancel: Callable[[], None]):
+        self.frame = ttk.Frame(parent)
+        self.on_cancel = on_cancel
+        
+        self.setup_ui()
+        
+    def setup_ui(self):
+        self.progress_bar = ttk.Progressbar(self.frame, length=200, mode='determinate', maximum=100)
+        self.progress_bar.pack(side=tk.LEFT, padx=5)
+        self.stage_label = ttk.Label(self.frame, text="")
+        self.stage_label.pack(side=tk.LEFT, padx=5)
+        self.cancel_button = ttk.Button(self.frame, text="Cancel", 
+                                        command=self.on_cancel, state='disabled')
+        self.cancel_button.pack(side=tk.LEFT, padx=5)
+    
+    def start(self) -> None:
+        """Show an empty bar and enable cancelling"""
+        self.progress_bar['value'] = 0
+        self.stage_label.config(text="Working...")
+        self.cancel_button.config(state='normal')
+    
+    def update(self, stage: str, done: int, total: int) -> None:
+        """Show the progress of the current stage"""
+        self.progress_bar['value'] = 100 * done / total if total else 0
+        self.stage_label.config(text=f"{STAGE_LABELS.get(stage, stage)}...")
+    
+    def reset(self) -> None:
+        """Clear the bar once the task has finished"""
+        self.progress_bar['value'] = 0
+        self.stage_label.config(text="")
+        self.cancel_button.config(state='disabled')
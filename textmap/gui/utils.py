@@ -220,4 +220,22 @@ def show_info(message: str, title: str = "Information") -> None:
         message: Information message to display
         title: Dialog title
     """
-    messagebox.showinfo(title, message)
\ No newline at end of file
+    messagebox.showinfo(title, message)
+
+# Files at least this large are previewed page by page instead of loaded into the editor
+LARGE_FILE_SIZE = 8 * 1024 * 1024
+
+def is_large_file(file_path: str) -> bool:
+    """
+    Check whether a file should be opened in large file mode.
+    
+    Args:
+        file_path: Path of the file
+    
+    Returns:
+        True if the file is too large to load into a Text widget
+    """
+    try:
+        return os.path.getsize(file_path) >= LARGE_FILE_SIZE
+    except OSError:
+        return False
@@ -0,0 +1,101 @@
+import queue
+import threading
+import tkinter as tk
+from typing import Any, Callable, Optional
+
+class TaskCancelled(Exception):
+    """Raised inside a background task once the user has cancelled it."""
+
+class BackgroundTask:
+    """
+    Runs one long operation at a time on a worker thread so the Tk main loop
+    stays responsive. The worker never touches widgets: it posts progress and
+    results to a queue that the main thread polls with after().
+
+    The task function receives a report(stage, done, total) callback, suitable
+    as an encoder or carrier progress callback. Once cancel() is called the next
+    report raises TaskCancelled, which ends the task.
+    """
+
+    # Milliseconds between queue polls on the main thread
+    POLL_INTERVAL = 30
+
+    def __init__(self, widget: tk.Widget, on_progress: Callable[[str, int, int], None]):
+        """
+        Args:
+            widget: Any widget, used to schedule polls on the main loop
+            on_progress: Called on the main thread with the latest (stage, done, total)
+        """
+        self.widget = widget
+        self.on_progress = on_progress
+        self._messages: 'queue.Queue' = queue.Queue()
+        self._cancel = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._on_success: Optional[Callable[[Any], None]] = None
+        self._on_error: Optional[Callable[[Exception], None]] = None
+        self._on_cancel: Optional[Callable[[], None]] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self, func: Callable[[Callable[[str, int, int], None]], Any],
+              on_success: Callable[[Any], None], on_error: Callable[[Exception], None],
+              on_cancel: Optional[Callable[[], None]] = None) -> None:
+        """Run func(report) on a worker thread; exactly one of the handlers is called afterwards."""
+        if self.running:
+            raise RuntimeError("A task is already running")
+        self._cancel.clear()
+        self._on_success = on_success
+        self._on_error = on_error
+        self._on_cancel = on_cancel
+        self._thread = threading.Thread(target=self._run, args=(func,), daemon=True)
+        self._thread.start()
+        self.widget.after(self.POLL_INTERVAL, self._poll)
+
+    def cancel(self) -> None:
+        """Ask the running task to stop at its next progress report."""
+        self._cancel.set()
+
+    def _report(self, stage: str, done: int, total: int) -> None:
+        if self._cancel.is_set():
+            raise TaskCancelled()
+        self._messages.put(('progress', (stage, done, total)))
+
+    def _run(self, func: Callable[[Callable[[str, int, int], None]], Any]) -> None:
+        try:
+            self._messages.put(('done', func(self._report)))
+        except Exception as e:
+            # The encoder may wrap the cancellation in its own error
+            self._messages.put(('cancelled' if self._cancel.is_set() else 'error', e))
+
+    def _poll(self) -> None:
+        latest_progress = None
+        outcome = None
+        try:
+            while True:
+                kind, value = self._messages.get_nowait()
+                if kind == 'progress':
+                    latest_progress = value
+                else:
+                    outcome = (kind, value)
+        except queue.Empty:
+            pass
+
+        # Only the most recent progress is worth drawing
+        if latest_progress is not None:
+            self.on_progress(*latest_progress)
+
+        if outcome is None:
+            self.widget.after(self.POLL_INTERVAL, self._poll)
+            return
+
+        self._thread.join()
+        self._thread = None
+        kind, value = outcome
+        if kind == 'done':
+            self._on_success(value)
+        elif kind == 'error':
+            self._on_error(value)
+        elif self._on_cancel is not None:
+            self._on_cancel()
@@ -0,0 +1,224 @@
+import codecs
+import hashlib
+import os
+import struct
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+from .carrier import INDEX_SUFFIX, ProgressCallback
+from .text_processor import TextProcessor, TextStats
+
+# The index lives in the library directory itself
+LIBRARY_INDEX_NAME = '.textmap-library'
+_LIBRARY_MAGIC = b'TMLIB\x00\x00\x01'
+# magic, entry count
+_LIBRARY_HEADER = struct.Struct('<8sQ')
+# size, mtime (ns), SHA-256 of the file, the TextStats fields, length of the
+# UTF-8 relative path that follows the record
+_LIBRARY_RECORD = struct.Struct('<QQ32sQIQ??H')
+
+# Bytes read at a time when scanning a file
+_SCAN_BLOCK_SIZE = 1 << 20
+
+class LibraryEntry(NamedTuple):
+    """What the library knows about one carrier file, relative to the library directory."""
+    path: str
+    size: int
+    mtime_ns: int
+    digest: bytes
+    stats: TextStats
+
+    @property
+    def suitable(self) -> bool:
+        return TextProcessor.validate_stats(self.stats)
+
+def _scan_file(directory: str, path: str) -> Optional[LibraryEntry]:
+    """
+    Digest, validate and count one file in a single pass. Files that are not
+    UTF-8 text are recorded with empty statistics and a zero digest so later
+    refreshes skip them; unreadable files are left out.
+    """
+    digest = hashlib.sha256()
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    counts = Counter()
+    try:
+        with open(os.path.join(directory, path), 'rb') as f:
+            file_stat = os.fstat(f.fileno())
+            for block in iter(lambda: f.read(_SCAN_BLOCK_SIZE), b''):
+                digest.update(block)
+                decoder.decode(block)
+                counts.update(TextProcessor.extract_content_bytes(block).decode('ascii'))
+            decoder.decode(b'', final=True)
+    except UnicodeDecodeError:
+        digest, counts = None, Counter()
+    except OSError:
+        return None
+    return LibraryEntry(path, file_stat.st_size, file_stat.st_mtime_ns,
+                        digest.digest() if digest is not None else bytes(32),
+                        TextProcessor.stats_from_counts(counts))
+
+def carrier_files(directory: Union[str, Path]) -> Iterator[Tuple[str, os.stat_result]]:
+    """
+    Yield (path relative to directory, stat) for every candidate carrier file in
+    a directory tree, in sorted order. Hidden files and directories, and carrier
+    sidecar indexes, are skipped.
+    """
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = sorted(name for name in dirs if not name.startswith('.'))
+        for name in sorted(files):
+            if name.startswith('.') or name.endswith(INDEX_SUFFIX):
+                continue
+            path = os.path.join(root, name)
+            try:
+                file_stat = os.stat(path)
+            except OSError:
+                continue
+            yield os.path.relpath(path, directory), file_stat
+
+class CarrierLibrary:
+    """
+    Index of a directory of candidate carrier files, for picking a suitable
+    carrier without reading any of them.
+
+    refresh() scans the directory (in parallel) and records each file's size,
+    mtime, SHA-256 digest and validation statistics in a compact binary index
+    inside the directory; files whose size and mtime are unchanged are not read
+    again. pick() then answers from memory: suitable carriers are kept sorted by
+    content length, so finding one with at least N content characters is a
+    bisection plus one stat() call to confirm the file is unchanged.
+
+    The files considered are those listed by carrier_files().
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+        self.index_path = self.directory / LIBRARY_INDEX_NAME
+        self.entries: Dict[str, LibraryEntry] = self._load()
+        self._select()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _load(self) -> Dict[str, LibraryEntry]:
+        """Read the saved index; a missing or damaged index reads as empty."""
+        try:
+            with open(self.index_path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return {}
+
+        if len(data) < _LIBRARY_HEADER.size:
+            return {}
+        magic, count = _LIBRARY_HEADER.unpack_from(data)
+        if magic != _LIBRARY_MAGIC:
+            return {}
+
+        entries = {}
+        offset = _LIBRARY_HEADER.size
+        try:
+            for _ in range(count):
+                size, mtime_ns, digest, *stats, path_length = _LIBRARY_RECORD.unpack_from(data, offset)
+                offset += _LIBRARY_RECORD.size
+                path = data[offset:offset + path_length].decode('utf-8', 'surrogateescape')
+                offset += path_length
+                entries[path] = LibraryEntry(path, size, mtime_ns, digest, TextStats(*stats))
+        except struct.error:
+            return {}
+        if offset != len(data):
+            return {}
+        return entries
+
+    def save(self) -> Path:
+        """Write the index atomically; returns its path."""
+        parts = [_LIBRARY_HEADER.pack(_LIBRARY_MAGIC, len(self.entries))]
+        for entry in self.entries.values():
+            path = entry.path.encode('utf-8', 'surrogateescape')
+            parts.append(_LIBRARY_RECORD.pack(entry.size, entry.mtime_ns, entry.digest,
+                                              *entry.stats, len(path)))
+            parts.append(path)
+
+        temp_path = self.index_path.with_name(self.index_path.name + '.tmp')
+        with open(temp_path, 'wb') as f:
+            f.write(b''.join(parts))
+        os.replace(temp_path, self.index_path)
+        return self.index_path
+
+    def refresh(self, workers: Optional[int] = None,
+                progress: Optional[ProgressCallback] = None) -> Dict[str, int]:
+        """
+        Bring the index up to date with the directory and save it. Only new
+        files and files whose size or mtime changed are read, on `workers`
+        processes (default: CPU count). progress receives ("scan", files done,
+        files to scan). Returns the "scanned", "unchanged" and "removed" counts.
+        """
+        entries: Dict[str, LibraryEntry] = {}
+        pending: List[str] = []
+        for path, file_stat in carrier_files(self.directory):
+            entry = self.entries.get(path)
+            if entry is not None and (entry.size, entry.mtime_ns) == (file_stat.st_size, file_stat.st_mtime_ns):
+                entries[path] = entry
+            else:
+                pending.append(path)
+        unchanged = len(entries)
+        present = set(pending).union(entries)
+        removed = sum(1 for path in self.entries if path not in present)
+
+        def collect(scanned: Iterator[Optional[LibraryEntry]]) -> None:
+            for done, entry in enumerate(scanned, 1):
+                if entry is not None:
+                    entries[entry.path] = entry
+                if progress is not None:
+                    progress('scan', done, len(pending))
+
+        workers = workers or os.cpu_count() or 1
+        directories = [str(self.directory)] * len(pending)
+        if workers == 1 or len(pending) <= 1:
+            collect(map(_scan_file, directories, pending))
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as executor:
+                collect(executor.map(_scan_file, directories, pending, chunksize=8))
+
+        self.entries = entries
+        self._select()
+        self.save()
+        return {'scanned': len(pending), 'unchanged': unchanged, 'removed': removed}
+
+    def _select(self) -> None:
+        """Sort the suitable entries by content length for pick()."""
+        suitable = sorted((entry for entry in self.entries.values() if entry.suitable),
+                          key=lambda entry: (entry.stats.content_length, entry.path))
+        self._lengths = array('Q', (entry.stats.content_length for entry in suitable))
+        self._suitable = suitable
+
+    def candidates(self, min_length: int) -> List[LibraryEntry]:
+        """Suitable entries with at least min_length content characters, shortest first."""
+        return self._suitable[bisect_left(self._lengths, min_length):]
+
+    def pick(self, min_length: int, randomize: bool = False) -> Optional[Path]:
+        """
+        Path of a suitable carrier with at least min_length content characters:
+        the shortest one, or a random one with randomize. Files changed since
+        the last refresh are passed over. Returns None if there is none.
+        """
+        first = bisect_left(self._lengths, min_length)
+        count = len(self._suitable) - first
+        if count <= 0:
+            return None
+        start = 0
+        if randomize:
+            import secrets
+            start = secrets.randbelow(count)
+
+        for step in range(count):
+            entry = self._suitable[first + (start + step) % count]
+            path = self.directory / entry.path
+            try:
+                file_stat = os.stat(path)
+            except OSError:
+                continue
+            if (file_stat.st_size, file_stat.st_mtime_ns) == (entry.size, entry.mtime_ns):
+                return path
+        return None
@@ -0,0 +1,83 @@
+import threading
+import time
+from typing import Dict
+
+class _Stage:
+    """Times one call of a stage; a plain class so entering it stays cheap."""
+    __slots__ = ('collector', 'name', 'chars', 'start')
+
+    def __init__(self, collector: 'MetricsCollector', name: str, chars: int):
+        self.collector = collector
+        self.name = name
+        self.chars = chars
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        self.collector._record(self.name, time.perf_counter() - self.start, self.chars)
+
+class MetricsCollector:
+    """
+    Opt-in instrumentation for MnemonicEncoder. Records the number of calls, the
+    total duration and the characters processed for each stage, plus event
+    counters such as hash invocations and probe collisions during mapping.
+
+    One collector can be shared by several encoders and threads.
+    """
+
+    def __init__(self):
+        self._stages: Dict[str, Dict[str, float]] = {}
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def stage(self, name: str, chars: int = 0) -> _Stage:
+        """Context manager timing the enclosed block as one call of the named stage."""
+        return _Stage(self, name, chars)
+
+    def _record(self, name: str, seconds: float, chars: int) -> None:
+        with self._lock:
+            totals = self._stages.setdefault(name, {'calls': 0, 'seconds': 0.0, 'chars': 0})
+            totals['calls'] += 1
+            totals['seconds'] += seconds
+            totals['chars'] += chars
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Add to an event counter."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def reset(self) -> None:
+        """Forget everything recorded so far."""
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        """Copy of the recorded stages and counters."""
+        with self._lock:
+            return {
+                'stages': {name: dict(totals) for name, totals in self._stages.items()},
+                'counters': dict(self._counters),
+            }
+
+    def to_prometheus(self, prefix: str = 'textmap') -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines = []
+
+        for field, help_text in (('calls', 'Calls of each encoder stage'),
+                                 ('seconds', 'Time spent in each encoder stage'),
+                                 ('chars', 'Characters processed by each encoder stage')):
+            metric = f"{prefix}_stage_{field}_total"
+            lines.append(f"# HELP {metric} {help_text}.")
+            lines.append(f"# TYPE {metric} counter")
+            for name, totals in sorted(snapshot['stages'].items()):
+                lines.append(f'{metric}{{stage="{name}"}} {totals[field]}')
+
+        for name, value in sorted(snapshot['counters'].items()):
+            metric = f"{prefix}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+
+        return '\n'.join(lines) + '\n'
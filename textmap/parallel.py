@@ -0,0 +1,180 @@
+import codecs
+import mmap
+import os
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional, Sequence, Tuple
+from .carrier import ProgressCallback
+from .text_processor import TextProcessor
+
+# Multi-core preparation of large carriers. Inputs are split into chunks that
+# pool processes prepare independently; per-chunk results are stitched back
+# together with prefix sums, so everything matches the serial path exactly.
+#
+# In-memory text is shared with the workers through multiprocessing.shared_memory:
+# the UTF-8 bytes go into one buffer, and each worker writes the content of its
+# chunk into a second buffer at the chunk's own offset. Carrier files need no
+# copy at all, since every worker maps the file itself.
+
+# Bytes handled per pool task
+CHUNK_SIZE = 16 * 1024 * 1024
+
+def _ranges(size: int, chunk_size: int) -> List[Tuple[int, int]]:
+    return [(start, min(start + chunk_size, size)) for start in range(0, size, chunk_size)]
+
+def _run(stage: str, func: Callable, tasks: Sequence[tuple], workers: int, total: int,
+         progress: Optional[ProgressCallback]) -> list:
+    """Run func over the task argument tuples in a process pool, returning results in task order."""
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+        futures = [pool.submit(func, *task) for task in tasks]
+        results = []
+        try:
+            for future, task in zip(futures, tasks):
+                results.append(future.result())
+                if progress is not None:
+                    # Every task starts with the end of its byte range
+                    progress(stage, task[-1], total)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+    return results
+
+def _extract_chunk(input_name: str, output_name: str, start: int, end: int) -> int:
+    """Write the content of input[start:end] to output[start:]; return its length."""
+    from multiprocessing import shared_memory
+    source = shared_memory.SharedMemory(name=input_name)
+    target = shared_memory.SharedMemory(name=output_name)
+    try:
+        content = TextProcessor.extract_content_bytes(bytes(source.buf[start:end]))
+        target.buf[start:start + len(content)] = content
+        return len(content)
+    finally:
+        source.close()
+        target.close()
+
+def _count_chunk(input_name: str, start: int, end: int) -> Counter:
+    from multiprocessing import shared_memory
+    source = shared_memory.SharedMemory(name=input_name)
+    try:
+        return Counter(bytes(source.buf[start:end]).decode('ascii'))
+    finally:
+        source.close()
+
+def _shared_copy(data: bytes):
+    from multiprocessing import shared_memory
+    buffer = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+    buffer.buf[:len(data)] = data
+    return buffer
+
+def extract_content(text: str, workers: int, progress: Optional[ProgressCallback] = None,
+                    chunk_size: int = CHUNK_SIZE) -> str:
+    """Parallel TextProcessor.extract_content, reporting as the "normalize" stage."""
+    from multiprocessing import shared_memory
+    data = text.encode('utf-8', 'surrogatepass')
+    size = len(data)
+    source = _shared_copy(data)
+    del data
+    target = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    try:
+        chunks = _ranges(size, chunk_size)
+        lengths = _run('normalize', _extract_chunk,
+                       [(source.name, target.name, start, end) for start, end in chunks],
+                       workers, size, progress)
+
+        # Chunk i's content belongs after the content of all chunks before it
+        content = bytearray(sum(lengths))
+        offset = 0
+        for (start, _), length in zip(chunks, lengths):
+            content[offset:offset + length] = target.buf[start:start + length]
+            offset += length
+        return content.decode('ascii')
+    finally:
+        for buffer in (source, target):
+            buffer.close()
+            buffer.unlink()
+
+def count_content(content: str, workers: int, progress: Optional[ProgressCallback] = None,
+                  chunk_size: int = CHUNK_SIZE) -> Counter:
+    """Per-character counts of stripped content, reporting as the "validate" stage."""
+    source = _shared_copy(content.encode('ascii'))
+    try:
+        counts = Counter()
+        for chunk_counts in _run('validate', _count_chunk,
+                                 [(source.name, start, end) for start, end in _ranges(len(content), chunk_size)],
+                                 workers, len(content), progress):
+            counts.update(chunk_counts)
+        return counts
+    finally:
+        source.close()
+        source.unlink()
+
+def _char_boundary(data, position: int) -> int:
+    """
+    Move a chunk boundary forward past at most three UTF-8 continuation bytes.
+    In valid UTF-8 this lands on the start of a character; either way both
+    neighbouring chunks agree on it, so the chunks decode to the same verdict
+    as the whole file.
+    """
+    if position == 0:
+        return 0
+    end = min(position + 3, len(data))
+    while position < end and 0x80 <= data[position] < 0xC0:
+        position += 1
+    return position
+
+def _index_chunk(file_path: str, block_size: int, start: int, end: int) -> array:
+    """Content characters per block in file[start:end], checking that span is valid UTF-8."""
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        decode_end = _char_boundary(data, end) if end < len(data) else end
+        position = _char_boundary(data, start)
+        while position < decode_end:
+            decoder.decode(data[position:min(position + block_size, decode_end)])
+            position += block_size
+        decoder.decode(b'', final=True)
+
+        counts = array('Q')
+        for block_start in range(start, end, block_size):
+            block = data[block_start:min(block_start + block_size, end)]
+            counts.append(len(TextProcessor.extract_content_bytes(block)))
+        return counts
+
+def _count_file_chunk(file_path: str, block_size: int, start: int, end: int) -> Counter:
+    counts = Counter()
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        for block_start in range(start, end, block_size):
+            block = data[block_start:min(block_start + block_size, end)]
+            counts.update(TextProcessor.extract_content_bytes(block).decode('ascii'))
+    return counts
+
+def _file_ranges(size: int, block_size: int, chunk_size: int) -> List[Tuple[int, int]]:
+    # Chunks hold whole blocks so each block is counted by one worker
+    chunk_size = max(block_size, chunk_size - chunk_size % block_size)
+    return _ranges(size, chunk_size)
+
+def index_file(file_path: str, size: int, block_size: int, workers: int,
+               progress: Optional[ProgressCallback] = None, chunk_size: int = CHUNK_SIZE) -> array:
+    """Parallel MappedCarrier block index: content characters before each block."""
+    block_starts = array('Q', [0])
+    total = 0
+    for counts in _run('index', _index_chunk,
+                       [(os.fspath(file_path), block_size, start, end)
+                        for start, end in _file_ranges(size, block_size, chunk_size)],
+                       workers, size, progress):
+        for count in counts:
+            total += count
+            block_starts.append(total)
+    return block_starts
+
+def count_file(file_path: str, size: int, block_size: int, workers: int,
+               progress: Optional[ProgressCallback] = None, chunk_size: int = CHUNK_SIZE) -> Counter:
+    """Per-character counts of a carrier file's content, reporting as the "validate" stage."""
+    counts = Counter()
+    for chunk_counts in _run('validate', _count_file_chunk,
+                             [(os.fspath(file_path), block_size, start, end)
+                              for start, end in _file_ranges(size, block_size, chunk_size)],
+                             workers, size, progress):
+        counts.update(chunk_counts)
+    return counts
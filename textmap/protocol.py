@@ -0,0 +1,41 @@
+"""
+Wire format shared by `textmap serve` and `textmap client`.
+
+Each message is a 4-byte big-endian length followed by that many bytes of UTF-8
+JSON. A request is an object with an "op" field; the reply is an object with
+"ok" and either the result fields or "error".
+"""
+import json
+import struct
+from typing import Dict
+
+HEADER = struct.Struct('>I')
+
+# Largest message either side accepts; carriers sent inline must fit in it
+MAX_MESSAGE_SIZE = 64 * 1024 * 1024
+
+# Environment variable naming the default socket path
+SOCKET_ENV = 'TEXTMAP_SOCKET'
+
+def pack_message(message: Dict[str, object]) -> bytes:
+    """Serialize a message with its length prefix."""
+    payload = json.dumps(message, separators=(',', ':')).encode('utf-8')
+    if len(payload) > MAX_MESSAGE_SIZE:
+        raise ValueError(f"Message of {len(payload)} bytes exceeds the {MAX_MESSAGE_SIZE} byte limit")
+    return HEADER.pack(len(payload)) + payload
+
+def unpack_payload(payload: bytes) -> Dict[str, object]:
+    """Parse a message body (without its length prefix)."""
+    try:
+        message = json.loads(payload.decode('utf-8'))
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Invalid message: {str(e)}")
+    if not isinstance(message, dict):
+        raise ValueError("Invalid message: expected a JSON object")
+    return message
+
+def check_length(length: int) -> int:
+    """Validate a length prefix before reading the body."""
+    if length > MAX_MESSAGE_SIZE:
+        raise ValueError(f"Message of {length} bytes exceeds the {MAX_MESSAGE_SIZE} byte limit")
+    return length
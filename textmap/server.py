@@ -0,0 +1,301 @@
+import asyncio
+import logging
+import os
+import signal
+import socket
+import stat
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional, Tuple
+from . import __version__
+from .carrier import Carrier, CarrierCache, MappedCarrier, TextCarrier
+from .encoder import MnemonicEncoder
+from .protocol import HEADER, check_length, pack_message, unpack_payload
+from .text_processor import TextProcessor
+
+logger = logging.getLogger(__name__)
+
+class _OpenFile:
+    """A prepared carrier file shared by requests, closed once retired and unused."""
+    __slots__ = ('carrier', 'stamp', 'resident_bytes', 'users', 'retired')
+
+    def __init__(self, carrier: Carrier, stamp: Tuple[int, int], resident_bytes: int):
+        self.carrier = carrier
+        self.stamp = stamp
+        self.resident_bytes = resident_bytes
+        self.users = 0
+        self.retired = False
+
+class TextMapServer:
+    """
+    Long-running encode/decode service for a Unix domain socket.
+
+    One process keeps warm encoders, a CarrierCache for carriers sent inline and
+    the carrier files used recently, so a request for a known carrier costs a
+    stat() call plus the mapping itself. Files are held as prepared in-memory
+    carriers up to max_resident_bytes of content in total; larger files stay
+    memory-mapped. Connections are served concurrently; the work of each request
+    runs on a thread pool so a long scan never holds up the event loop.
+
+    Requests (see textmap.protocol for the framing):
+        {"op": "encode", "mnemonic": ..., "text_file" | "text": ...,
+         "key_version": "v1", "key_format": "text", "output": path}
+            -> {"ok": true, "key": ..., "suitable": bool, "encoded_text": ...}
+            "encoded_text" is only sent when no output path is given.
+        {"op": "decode", "key": ..., "text_file" | "text": ...} -> {"ok": true, "decoded": ...}
+        {"op": "convert-key", "key": ..., "to": "text" | "binary"} -> {"ok": true, "key": ...}
+        {"op": "ping"} -> {"ok": true, "version": ...}
+        {"op": "stats"} -> {"ok": true, "requests": ..., "open_files": ...,
+                            "resident_bytes": ..., "cache": {...}}
+    Failed requests get {"ok": false, "error": message}.
+    """
+
+    def __init__(self, socket_path: str, cache: Optional[CarrierCache] = None,
+                 max_open_files: int = 64, max_resident_bytes: int = 256 * 1024 * 1024,
+                 workers: Optional[int] = None):
+        if max_open_files <= 0 or max_resident_bytes < 0:
+            raise ValueError("File cache bounds must be positive")
+        self.socket_path = socket_path
+        self.cache = cache if cache is not None else CarrierCache()
+        self.max_open_files = max_open_files
+        self.max_resident_bytes = max_resident_bytes
+        self.resident_bytes = 0
+        self.requests = 0
+        self._encoders: Dict[Tuple[str, str], MnemonicEncoder] = {}
+        self._files: 'OrderedDict[str, _OpenFile]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='textmap-serve')
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    def _encoder(self, key_version: str, key_format: str) -> MnemonicEncoder:
+        """Warm encoder for a key version and format, shared by all requests."""
+        with self._lock:
+            encoder = self._encoders.get((key_version, key_format))
+            if encoder is None:
+                encoder = MnemonicEncoder(key_version=key_version, cache=self.cache, key_format=key_format)
+                self._encoders[(key_version, key_format)] = encoder
+            return encoder
+
+    def _open_file(self, file_path: str, size: int) -> Tuple[Carrier, int]:
+        """Prepare a carrier file, in memory if it fits the resident budget; returns (carrier, resident bytes)."""
+        if size <= self.max_resident_bytes:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                carrier = TextCarrier(f.read())
+            return carrier, len(carrier)
+        return MappedCarrier(file_path), 0
+
+    @contextmanager
+    def _file_carrier(self, file_path: str) -> Iterator[Carrier]:
+        """Lease the prepared carrier of a file, reopening it if the file changed."""
+        file_path = os.path.abspath(file_path)
+        file_stat = os.stat(file_path)
+        stamp = (file_stat.st_size, file_stat.st_mtime_ns)
+
+        with self._lock:
+            entry = self._files.get(file_path)
+            if entry is not None and entry.stamp == stamp:
+                self._files.move_to_end(file_path)
+                entry.users += 1
+            else:
+                entry = None
+
+        if entry is None:
+            # Opening reads or scans the file, so it happens outside the lock
+            carrier, resident_bytes = self._open_file(file_path, file_stat.st_size)
+            entry = _OpenFile(carrier, stamp, resident_bytes)
+            with self._lock:
+                previous = self._files.pop(file_path, None)
+                if previous is not None:
+                    self._retire(previous)
+                self._files[file_path] = entry
+                self.resident_bytes += entry.resident_bytes
+                entry.users += 1
+                # The newest entry is never evicted, even if it alone exceeds a bound
+                while len(self._files) > 1 and (len(self._files) > self.max_open_files or
+                                                self.resident_bytes > self.max_resident_bytes):
+                    _, evicted = self._files.popitem(last=False)
+                    self._retire(evicted)
+
+        try:
+            yield entry.carrier
+        finally:
+            with self._lock:
+                entry.users -= 1
+                if entry.retired and not entry.users:
+                    entry.carrier.close()
+
+    def _retire(self, entry: _OpenFile) -> None:
+        """Stop handing out a carrier; it is closed by its last user. Call with the lock held."""
+        entry.retired = True
+        self.resident_bytes -= entry.resident_bytes
+        if not entry.users:
+            entry.carrier.close()
+
+    @contextmanager
+    def _carrier(self, request: Dict[str, object]) -> Iterator[Carrier]:
+        if request.get('text_file'):
+            with self._file_carrier(str(request['text_file'])) as carrier:
+                yield carrier
+        elif isinstance(request.get('text'), str):
+            yield self.cache.get(request['text'])
+        else:
+            raise ValueError("Request needs 'text_file' or 'text'")
+
+    @staticmethod
+    def _required(request: Dict[str, object], field: str) -> str:
+        value = request.get(field)
+        if not isinstance(value, str) or not value:
+            raise ValueError(f"Request needs '{field}'")
+        return value
+
+    def handle_request(self, request: Dict[str, object]) -> Dict[str, object]:
+        """Run one request and return its reply; errors are reported in the reply."""
+        with self._lock:
+            self.requests += 1
+        try:
+            return self._dispatch(request)
+        except (ValueError, OSError) as e:
+            return {'ok': False, 'error': str(e)}
+        except Exception as e:
+            logger.exception("Request failed")
+            return {'ok': False, 'error': f"Internal error: {str(e)}"}
+
+    def _dispatch(self, request: Dict[str, object]) -> Dict[str, object]:
+        op = request.get('op')
+
+        if op == 'encode':
+            mnemonic = self._required(request, 'mnemonic')
+            encoder = self._encoder(str(request.get('key_version', 'v1')),
+                                    str(request.get('key_format', 'text')))
+            output = request.get('output')
+            with self._carrier(request) as carrier:
+                reply = {'ok': True, 'suitable': carrier.is_suitable(),
+                         'key': encoder.encode_key(mnemonic, carrier)}
+                formatted = TextProcessor.iter_format_output(carrier.iter_content())
+                if output:
+                    with open(str(output), 'w', encoding='utf-8') as f:
+                        f.writelines(formatted)
+                else:
+                    reply['encoded_text'] = ''.join(formatted)
+            return reply
+
+        if op == 'decode':
+            key = self._required(request, 'key')
+            with self._carrier(request) as carrier:
+                return {'ok': True, 'decoded': self._encoder('v1', 'text').decode(carrier, key)}
+
+        if op == 'convert-key':
+            key = self._required(request, 'key')
+            return {'ok': True, 'key': self._encoder('v1', 'text').convert_key(key, self._required(request, 'to'))}
+
+        if op == 'ping':
+            return {'ok': True, 'version': __version__}
+
+        if op == 'stats':
+            with self._lock:
+                requests, open_files, resident_bytes = self.requests, len(self._files), self.resident_bytes
+            return {'ok': True, 'requests': requests, 'open_files': open_files,
+                    'resident_bytes': resident_bytes, 'cache': self.cache.info()}
+
+        raise ValueError(f"Unknown op: {op!r}")
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer the requests of one connection in order until the client hangs up."""
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(HEADER.size)
+                except asyncio.IncompleteReadError:
+                    break
+                try:
+                    length = check_length(HEADER.unpack(header)[0])
+                except ValueError as e:
+                    # The stream cannot be resynchronized after an oversized message
+                    writer.write(pack_message({'ok': False, 'error': str(e)}))
+                    break
+                payload = await reader.readexactly(length)
+
+                try:
+                    request = unpack_payload(payload)
+                except ValueError as e:
+                    reply = {'ok': False, 'error': str(e)}
+                else:
+                    reply = await loop.run_in_executor(self._executor, self.handle_request, request)
+                try:
+                    message = pack_message(reply)
+                except ValueError as e:
+                    message = pack_message({'ok': False, 'error': str(e)})
+                writer.write(message)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def _remove_stale_socket(self) -> None:
+        """Remove a socket file left behind by a server that is no longer running."""
+        try:
+            mode = os.stat(self.socket_path).st_mode
+        except FileNotFoundError:
+            return
+        if not stat.S_ISSOCK(mode):
+            raise ValueError(f"{self.socket_path} exists and is not a socket")
+
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            os.unlink(self.socket_path)
+            return
+        finally:
+            probe.close()
+        raise ValueError(f"A server is already listening on {self.socket_path}")
+
+    async def start(self) -> None:
+        """Bind the socket and start accepting connections."""
+        self._remove_stale_socket()
+        # Requests carry secrets, so only the owner may connect
+        previous_umask = os.umask(0o177)
+        try:
+            self._server = await asyncio.start_unix_server(self._handle_connection, path=self.socket_path)
+        finally:
+            os.umask(previous_umask)
+
+    async def serve_forever(self, ready: Optional[Callable[[], None]] = None) -> None:
+        """Serve until cancelled, SIGINT or SIGTERM, then clean up. ready() is called once listening."""
+        await self.start()
+        if ready is not None:
+            ready()
+        loop = asyncio.get_running_loop()
+        stopped = loop.create_future()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, lambda: stopped.done() or stopped.set_result(None))
+        try:
+            await stopped
+        finally:
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                loop.remove_signal_handler(signum)
+            await self.stop()
+
+    async def stop(self) -> None:
+        """Stop accepting connections and release the socket, thread pool and carriers."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+            try:
+                os.unlink(self.socket_path)
+            except FileNotFoundError:
+                pass
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            while self._files:
+                _, entry = self._files.popitem()
+                self._retire(entry)
+
+def serve(socket_path: str, ready: Optional[Callable[[], None]] = None, **options) -> None:
+    """Run a TextMapServer on socket_path until interrupted."""
+    asyncio.run(TextMapServer(socket_path, **options).serve_forever(ready))
@@ -1,13 +1,59 @@
+import os
 import re
 import unicodedata
-from pathlib import Path
-from typing import Union, Tuple
+from collections import Counter
+from typing import TYPE_CHECKING, Iterable, Iterator, NamedTuple, Optional, Union
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+# Characters to preserve (alphanumeric + punctuation + whitespace)
+_VALID_CHARACTERS = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789.,!? \n\t'
+
+# Byte table for ASCII text: valid characters map to themselves, everything else to a space
+_ASCII_NORMALIZE_TABLE = bytes(
+    byte if chr(byte) in _VALID_CHARACTERS else ord(' ') for byte in range(256)
+)
+
+# Runs of non-ASCII characters, which are never valid
+_NON_ASCII_RUN = re.compile(r'[^\x00-\x7f]+')
+
+# Bytes that never survive normalization and whitespace stripping. Every byte of a
+# UTF-8 encoded non-ASCII character is >= 0x80, so deleting these from the encoded
+# text leaves exactly the content characters.
+_NON_CONTENT_BYTES = bytes(
+    byte for byte in range(256)
+    if chr(byte) not in _VALID_CHARACTERS or chr(byte).isspace()
+)
+
+# ASCII characters that str.isspace() treats as whitespace
+_ASCII_WHITESPACE_BYTES = bytes(byte for byte in range(128) if chr(byte).isspace())
+
+# Characters fed to a TextValidator at a time when checking whole texts
+_VALIDATE_STEP = 1 << 16
+
+class TextStats(NamedTuple):
+    """Character statistics that decide whether a text is suitable for encoding."""
+    content_length: int
+    unique_chars: int
+    max_char_count: int
+    has_upper: bool
+    has_lower: bool
 
 class TextProcessor:
     """Handles text processing and normalization for various file formats."""
     
     # Characters to preserve (alphanumeric + punctuation + whitespace)
-    VALID_CHARS = set('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789.,!? \n\t')
+    VALID_CHARS = set(_VALID_CHARACTERS)
+    
+    # Explanation shown when a text fails validation
+    UNSUITABLE_TEXT_MESSAGE = (
+        "Text is not suitable for encoding. Ensure the source text:\n"
+        "- Has at least 100 non-whitespace characters\n"
+        "- Contains at least 20 unique characters\n"
+        "- Has a good mix of upper and lowercase letters\n"
+        "- Doesn't have any character appearing too frequently"
+    )
     
     @classmethod
     def normalize_text(cls, text: str) -> str:
@@ -19,15 +65,13 @@ class TextProcessor:
         if not text:
             return ""
         
+        # Blank out non-ASCII characters first (one space per character) so the
+        # rest can be handled by a single byte-table translation
+        if not text.isascii():
+            text = _NON_ASCII_RUN.sub(lambda match: ' ' * len(match.group()), text)
+        
         # Replace any characters not in VALID_CHARS with spaces
-        normalized_chars = []
-        for char in text:
-            if char in cls.VALID_CHARS:
-                normalized_chars.append(char)
-            else:
-                normalized_chars.append(' ')
-                
-        return ''.join(normalized_chars)
+        return text.encode('ascii').translate(_ASCII_NORMALIZE_TABLE).decode('ascii')
 
     @classmethod
     def format_output(cls, text: str) -> str:
@@ -52,57 +96,213 @@ class TextProcessor:
         return ''.join(chars)
 
     @classmethod
-    def validate_text_source(cls, text: str) -> bool:
-        """Verify that text is suitable for encoding."""
+    def extract_content_bytes(cls, data: bytes) -> bytes:
+        """Keep only the content characters of UTF-8 encoded text."""
+        return data.translate(None, _NON_CONTENT_BYTES)
+
+    @classmethod
+    def extract_content(cls, text: str) -> str:
+        """
+        Normalize text and drop all whitespace in a single pass, leaving only the
+        content characters used for position mapping.
+        """
         if not text:
-            return False
-            
+            return ""
+        content = cls.extract_content_bytes(text.encode('utf-8', 'surrogatepass'))
+        return content.decode('ascii')
+
+    @classmethod
+    def text_stats(cls, text: str) -> TextStats:
+        """Collect the statistics validate_text_source checks, counting each character once."""
+        return cls.stats_from_counts(cls.content_counts(text))
+
+    @staticmethod
+    def content_counts(text: str) -> Counter:
+        """Count the non-whitespace characters of text."""
+        if text.isascii():
+            content = text.encode('ascii').translate(None, _ASCII_WHITESPACE_BYTES)
+            return Counter(content.decode('ascii'))
+        counts = Counter(text)
+        for char in [char for char in counts if char.isspace()]:
+            del counts[char]
+        return counts
+
+    @classmethod
+    def stats_from_counts(cls, counts: Counter) -> TextStats:
+        """Build text statistics from per-character counts of non-whitespace characters."""
+        return TextStats(
+            content_length=sum(counts.values()),
+            unique_chars=len(counts),
+            max_char_count=max(counts.values(), default=0),
+            has_upper=any(char.isupper() for char in counts),
+            has_lower=any(char.islower() for char in counts),
+        )
+
+    @staticmethod
+    def _format_lines(content: str) -> str:
+        """Format whole 80-character lines of content as format_output would."""
+        if not content.isascii():
+            return ''.join(
+                ' '.join(content[line + i:line + i + 5] for i in range(0, 80, 5)) + '\n'
+                for line in range(0, len(content), 80)
+            )
+
+        # Each line of 80 characters becomes 16 groups of 5 separated by spaces
+        # plus a newline, 96 bytes in all. Copy each column with one strided slice.
+        data = content.encode('ascii')
+        lines = len(data) // 80
+        formatted = bytearray(b' ') * (lines * 96)
+        for group in range(16):
+            for i in range(5):
+                formatted[group * 6 + i::96] = data[group * 5 + i::80]
+        formatted[95::96] = b'\n' * lines
+        return formatted.decode('ascii')
+
+    @classmethod
+    def iter_format_output(cls, chunks: Iterable[str]) -> Iterator[str]:
+        """
+        Streaming variant of format_output for chunks of content characters
+        (no whitespace). Yields the formatted text piece by piece.
+        """
+        pending = ''
+        for chunk in chunks:
+            pending += chunk
+            complete = len(pending) - len(pending) % 80
+            if complete:
+                yield cls._format_lines(pending[:complete])
+                pending = pending[complete:]
+        
+        if pending:
+            groups = [pending[i:i + 5] for i in range(0, len(pending), 5)]
+            yield ' '.join(groups) + (' ' if len(pending) % 5 == 0 else '')
+
+    @classmethod
+    def validate_stats(cls, stats: TextStats) -> bool:
+        """Verify that text with the given statistics is suitable for encoding."""
         # Check text length (ignoring whitespace)
-        non_whitespace = ''.join(char for char in text if not char.isspace())
-        if len(non_whitespace) < 100:
+        if stats.content_length < 100:
             return False
             
         # Check character variety
-        unique_chars = set(char for char in text if not char.isspace())
-        if len(unique_chars) < 20:
+        if stats.unique_chars < 20:
             return False
             
         # Check character distribution
-        char_counts = {}
-        total_chars = 0
-        for char in non_whitespace:
-            char_counts[char] = char_counts.get(char, 0) + 1
-            total_chars += 1
-            
-        if total_chars > 0:
-            max_freq = max(char_counts.values()) / total_chars
-            if max_freq > 0.3:
-                return False
+        max_freq = stats.max_char_count / stats.content_length
+        if max_freq > 0.3:
+            return False
                 
         # Check for both upper and lowercase
-        has_upper = any(c.isupper() for c in text)
-        has_lower = any(c.islower() for c in text)
-        if not (has_upper and has_lower):
+        if not (stats.has_upper and stats.has_lower):
             return False
             
         return True
+
+    @classmethod
+    def validate_text_source(cls, text: str) -> bool:
+        """Verify that text is suitable for encoding, stopping once the verdict is certain."""
+        if not text:
+            return False
+        validator = TextValidator(len(text))
+        for start in range(0, len(text), _VALIDATE_STEP):
+            if validator.feed(text[start:start + _VALIDATE_STEP]) is not None:
+                break
+        return validator.result()
         
     @classmethod
-    def prepare_text_for_encoding(cls, file_path: Union[str, Path]) -> str:
+    def prepare_text_for_encoding(cls, file_path: Union[str, 'Path']) -> str:
         """Prepare text from a file for encoding."""
-        # Read the file using appropriate encoding
+        # Read the file using appropriate encoding; validation runs as it is read
+        chunks = []
         with open(file_path, 'r', encoding='utf-8') as f:
-            text = f.read()
-            
-        normalized_text = cls.normalize_text(text)
+            # The byte size bounds the number of characters still to come
+            validator = TextValidator(os.fstat(f.fileno()).st_size)
+            for chunk in iter(lambda: f.read(_VALIDATE_STEP), ''):
+                chunk = cls.normalize_text(chunk)
+                chunks.append(chunk)
+                if validator.verdict is None:
+                    validator.feed(chunk)
         
-        if not cls.validate_text_source(normalized_text):
-            raise ValueError(
-                "Text is not suitable for encoding. Ensure the source text:\n"
-                "- Has at least 100 non-whitespace characters\n"
-                "- Contains at least 20 unique characters\n"
-                "- Has a good mix of upper and lowercase letters\n"
-                "- Doesn't have any character appearing too frequently"
-            )
+        if not validator.result():
+            raise ValueError(cls.UNSUITABLE_TEXT_MESSAGE)
             
-        return normalized_text
\ No newline at end of file
+        return ''.join(chunks)
+
+class TextValidator:
+    """
+    Incremental TextProcessor.validate_text_source for text fed in chunks.
+
+    Only per-character counts are kept, so memory is bounded by the number of
+    distinct characters. Any rule can still flip while more text may follow, so
+    a verdict is only reached early when the total size is known: feed() returns
+    it as soon as no possible remainder could change it. result() always gives
+    the verdict for the text fed so far, exactly as validate_text_source would.
+    """
+
+    def __init__(self, size: Optional[int] = None):
+        """
+        Args:
+            size: Upper bound on the number of characters that will be fed, if known
+        """
+        self.remaining = size
+        self.counts = Counter()
+        self.content_length = 0
+        self.max_char_count = 0
+        self.has_upper = False
+        self.has_lower = False
+        # Set once the outcome can no longer change
+        self.verdict: Optional[bool] = None
+
+    def feed(self, chunk: str, size: Optional[int] = None) -> Optional[bool]:
+        """
+        Add the next piece of text and return the verdict if it is now certain.
+        size is how much of the declared total the piece accounts for, when
+        that is more than its length (e.g. the stripped content of a raw block).
+        """
+        if self.remaining is not None:
+            self.remaining -= len(chunk) if size is None else size
+            if self.remaining < 0:
+                raise ValueError("More text fed than the declared size")
+
+        chunk_counts = TextProcessor.content_counts(chunk)
+        if chunk_counts:
+            counts = self.counts
+            counts.update(chunk_counts)
+            self.content_length += sum(chunk_counts.values())
+            self.max_char_count = max(self.max_char_count, max(counts[char] for char in chunk_counts))
+            self.has_upper = self.has_upper or any(char.isupper() for char in chunk_counts)
+            self.has_lower = self.has_lower or any(char.islower() for char in chunk_counts)
+
+        if self.verdict is None:
+            self.verdict = self._decide()
+        return self.verdict
+
+    def _decide(self) -> Optional[bool]:
+        """The verdict if every possible remainder leads to it, else None."""
+        if self.remaining is None:
+            return None
+        if not self.remaining:
+            return self.result()
+
+        # The remainder adds at most this many characters, each possibly new,
+        # and in the worst case all of them the most frequent character
+        remaining = self.remaining
+        most_length = self.content_length + remaining
+        if most_length < 100 or len(self.counts) + remaining < 20:
+            return False
+        if self.max_char_count / most_length > 0.3:
+            return False
+        if (self.content_length >= 100 and len(self.counts) >= 20 and self.has_upper and self.has_lower
+                and (self.max_char_count + remaining) / most_length <= 0.3):
+            return True
+        return None
+
+    @property
+    def stats(self) -> TextStats:
+        """Statistics of the text fed so far."""
+        return TextStats(self.content_length, len(self.counts), self.max_char_count,
+                         self.has_upper, self.has_lower)
+
+    def result(self) -> bool:
+        """Verdict for the text fed so far."""
+        return TextProcessor.validate_stats(self.stats)
\ No newline at end of file